@@ -1,19 +1,36 @@
-import gradio as gr
-import google.generativeai as genai
-from gtts import gTTS
-import pyttsx3
 import tempfile
 import os
 from uuid import uuid4
 import time
+import urllib.parse
+import types
+import logging
 import asyncio
-from pydub import AudioSegment
-try:
-    import edge_tts
-    EDGE_TTS_AVAILABLE = True
-except ImportError:
-    EDGE_TTS_AVAILABLE = False
-    print("Edge TTS not available, using fallback options")
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from segment_cache import SegmentCache
+from artifact_store import ArtifactStore
+from script_cache import ScriptCache
+from audio_assembly import OUTPUT_FORMATS, assemble_episode
+from post_processing import PostProcess, process_episode
+import atexit
+import weakref
+from event_loop_worker import EventLoopWorker
+from pyttsx3_pool import Pyttsx3Pool
+from backends import BackendRegistry
+from metrics import Metrics
+from jobs import FAILED, JobManager
+from hedged_tts import HedgedSpeech, HedgePolicy, TTSBackend, run_blocking
+from turn_store import TurnStore
+from turn_planner import batch_text, batch_turns, locate_turns, plan_turns, split_at_sentences, turn_gaps
+from mp3_splice import split_mp3
+from gemini_pool import GeminiPool
+
+logger = logging.getLogger("podcast")
+
+# Gemini and the TTS engines are imported the first time they are used
+BACKENDS = BackendRegistry()
 
 # Voice configurations for different speakers
 VOICE_CONFIGS = {
@@ -34,72 +51,452 @@ VOICE_CONFIGS = {
     ]
 }
 
-# Initialize Gemini client
-client = None
+# Maximum number of Edge TTS requests in flight per episode
+EDGE_TTS_MAX_CONCURRENCY = 4
+
+# Maximum number of Edge TTS requests in flight across all jobs of this process
+EDGE_TTS_PROCESS_CONCURRENCY = int(os.environ.get("PODCAST_TTS_CONCURRENCY", "16"))
+
+# Pause between speaker turns in the combined episode
+SPEAKER_GAP_MS = 500
+
+# Engines tried in order for each multi-speaker turn when the previous one fails
+TTS_FALLBACK_ORDER = [name.strip() for name in os.environ.get("PODCAST_TTS_FALLBACK", "edge,gtts-accents,pyttsx3").split(",")
+                      if name.strip()]
+# Per-request timeout, retries per engine, and the latency percentile after
+# which a duplicate request is raised ("off" disables hedging)
+TTS_TIMEOUT_SECONDS = float(os.environ.get("PODCAST_TTS_TIMEOUT", "30"))
+TTS_RETRIES = int(os.environ.get("PODCAST_TTS_RETRIES", "1"))
+TTS_HEDGE_PERCENTILE = os.environ.get("PODCAST_TTS_HEDGE_PERCENTILE", "95")
+
+# Turn planning: consecutive turns of a speaker are packed up to the target,
+# longer turns are split at sentences (see turn_planner.plan_turns)
+TURN_TARGET_CHARS = int(os.environ.get("PODCAST_TURN_TARGET_CHARS", "800"))
+TURN_MAX_CHARS = int(os.environ.get("PODCAST_TURN_MAX_CHARS", "1500"))
+# Batched mode voices several turns of one speaker per Edge TTS request; Edge
+# TTS opens a new connection for every ~4 KB of text, so batches stay below it
+TTS_BATCHED = os.environ.get("PODCAST_TTS_BATCHED", "0").lower() in ("1", "true", "yes")
+TTS_BATCH_CHARS = int(os.environ.get("PODCAST_TTS_BATCH_CHARS", "3500"))
+
+# Stage timings, served on PODCAST_METRICS_PORT when app.py runs (0 disables)
+METRICS = Metrics()
+METRICS_PORT = int(os.environ.get("PODCAST_METRICS_PORT", "9464"))
+LOG_LEVEL = os.environ.get("PODCAST_LOG_LEVEL", "INFO").upper()
+
+# Short engine names used as metric labels
+TTS_ENGINE_LABELS = {
+    "Multi-Speaker (Edge TTS)": "edge",
+    "Multi-Speaker (gTTS accents)": "gtts-accents",
+    "gTTS (Online)": "gtts",
+    "pyttsx3 (Offline)": "pyttsx3",
+}
+
+# Whole-episode post-processing (see post_processing.PostProcess): per-turn
+# loudness normalization in dBFS, crossfades instead of pauses, a background
+# bed and the output sample rate. All of them are off by default, so MP3
+# episodes are spliced from the turn files without decoding or re-encoding.
+LOUDNESS_DB = os.environ.get("PODCAST_LOUDNESS_DB", "off")
+POST_PROCESS = PostProcess(
+    loudness_db=None if LOUDNESS_DB.lower() == "off" else float(LOUDNESS_DB),
+    crossfade_ms=int(os.environ.get("PODCAST_CROSSFADE_MS", "0")),
+    bed=os.environ.get("PODCAST_BED") or None,
+    bed_db=float(os.environ.get("PODCAST_BED_DB", "-30")),
+    sample_rate=int(os.environ.get("PODCAST_SAMPLE_RATE", "0")) or None,
+)
+
+# Episode file format: "mp3", "ogg" (Opus) or "wav"; see audio_assembly.OUTPUT_FORMATS
+OUTPUT_FORMAT = os.environ.get("PODCAST_OUTPUT_FORMAT", "mp3")
+
+# Shared cache of synthesized segments (safe to point several workers at one directory)
+SEGMENT_CACHE = SegmentCache(
+    os.environ.get(
+        "PODCAST_SEGMENT_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "agentpodcast_segment_cache")
+    ),
+    max_bytes=int(os.environ.get("PODCAST_SEGMENT_CACHE_MB", "512")) * 1024 * 1024
+)
+
+# Speech settings that feed into segment cache keys
+GTTS_LANG = "en"
+GTTS_TLD = "com"
+PYTTSX3_RATE = 180
+EDGE_TTS_RATE = "+0%"
+
+# Cache of generated scripts, so re-renders with another voice engine skip Gemini
+SCRIPT_CACHE = ScriptCache(
+    os.environ.get(
+        "PODCAST_SCRIPT_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "agentpodcast_script_cache")
+    ),
+    max_bytes=int(os.environ.get("PODCAST_SCRIPT_CACHE_MB", "64")) * 1024 * 1024,
+    ttl_seconds=float(os.environ.get("PODCAST_SCRIPT_CACHE_TTL_HOURS", "168")) * 3600
+)
+
+# Finished episodes and intermediate turn files; orphans of crashed processes are removed at startup
+ARTIFACTS = ArtifactStore(
+    os.environ.get(
+        "PODCAST_ARTIFACT_DIR",
+        os.path.join(tempfile.gettempdir(), "agentpodcast_artifacts")
+    ),
+    max_bytes=int(os.environ.get("PODCAST_ARTIFACT_MB", "2048")) * 1024 * 1024,
+    ttl_seconds=float(os.environ.get("PODCAST_ARTIFACT_TTL_HOURS", "24")) * 3600
+)
+ARTIFACTS.cleanup_orphans()
+
+# Turn audio of the most recent renders, reused when an edited script is re-rendered
+RENDERS = TurnStore(ARTIFACTS, int(os.environ.get("PODCAST_RERENDER_KEEP", "8")))
+atexit.register(ARTIFACTS.close)
+
+# Bump whenever build_script_prompt or build_segment_prompt changes, so cached scripts are not reused
+SCRIPT_PROMPT_VERSION = 1
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
+
+# Long-document mode: chunk size
+LONG_FORM_CHUNK_CHARS = 2500
+
+# Per API key: request quota, calls in flight and retries after a quota error
+GEMINI_REQUESTS_PER_MINUTE = float(os.environ.get("PODCAST_GEMINI_RPM", "60"))
+GEMINI_BURST = int(os.environ.get("PODCAST_GEMINI_BURST", "4"))
+GEMINI_MAX_PARALLEL_CALLS = int(os.environ.get("PODCAST_GEMINI_CONCURRENCY", "4"))
+GEMINI_QUOTA_RETRIES = int(os.environ.get("PODCAST_GEMINI_RETRIES", "4"))
+
+# gTTS has one voice per language/accent, so speakers are told apart by accent (lang, tld)
+GTTS_SPEAKER_ACCENTS = [("en", "com"), ("en", "co.uk"), ("en", "com.au"), ("en", "co.in")]
+# Turns longer than this are split at sentence boundaries and fetched in parallel
+GTTS_PIECE_CHARS = 200
+GTTS_MAX_WORKERS = 8
+# Base URL replacing https://translate.google.<tld> (e.g. a local stand-in server)
+GTTS_ENDPOINT = os.environ.get("PODCAST_GTTS_ENDPOINT")
+# Seconds before a gTTS HTTP request gives up; its thread cannot be cancelled otherwise
+GTTS_TIMEOUT_SECONDS = TTS_TIMEOUT_SECONDS
+
+# Offline synthesis: pyttsx3 engines kept warm in a process pool (default one per core)
+PYTTSX3_WORKERS = int(os.environ.get("PODCAST_PYTTSX3_WORKERS", "0")) or None
+
+@BACKENDS.register("gemini", requires=("google.generativeai",))
+def _load_gemini():
+    import google.generativeai as genai
+    from google.generativeai import client
+    
+    # Per-key clients rely on the SDK's private client manager and on the
+    # model's ``_client`` slot; refuse versions they were not checked against
+    # instead of silently sharing one key
+    if tuple(genai.__version__.split(".")[:2]) != ("0", "8") or not hasattr(client, "_ClientManager"):
+        raise ImportError(f"google-generativeai {genai.__version__} is not supported (per-key clients need 0.8.x)")
+    return types.SimpleNamespace(GenerativeModel=genai.GenerativeModel, ClientManager=client._ClientManager)
+
+@BACKENDS.register("gtts", requires=("gtts",))
+def _load_gtts():
+    from gtts import gTTS
+    
+    # The endpoint override hooks a private gTTS method
+    if not hasattr(gTTS, "_prepare_requests"):
+        if GTTS_ENDPOINT:
+            logger.warning("⚠️ This gTTS version cannot be pointed at PODCAST_GTTS_ENDPOINT; using Google directly")
+        return gTTS
+    
+    class EndpointGTTS(gTTS):
+        """gTTS that sends its requests to GTTS_ENDPOINT when one is configured"""
+        def _prepare_requests(self):
+            prepared_requests = super()._prepare_requests()
+            if GTTS_ENDPOINT:
+                for request in prepared_requests:
+                    path = urllib.parse.urlsplit(request.url).path
+                    request.prepare_url(GTTS_ENDPOINT.rstrip('/') + path, None)
+            return prepared_requests
+    
+    return EndpointGTTS
+
+@BACKENDS.register("pyttsx3", requires=("pyttsx3",))
+def _load_pyttsx3():
+    # pyttsx3 itself is only imported inside the pool processes
+    if not BACKENDS.available("pyttsx3"):
+        raise ImportError("pyttsx3 is not installed")
+    pool = Pyttsx3Pool(workers=PYTTSX3_WORKERS, rate=PYTTSX3_RATE)
+    atexit.register(pool.shutdown)
+    return pool
+
+@BACKENDS.register("edge_tts", requires=("edge_tts", "aiohttp"))
+def _load_edge_tts():
+    import aiohttp
+    import edge_tts
+    
+    class SharedTCPConnector(aiohttp.TCPConnector):
+        """TCP connector that outlives the ClientSession edge_tts opens per request
+
+        Keeps the DNS cache and TLS setup warm across turns and jobs; call
+        ``shutdown()`` to really close it.
+        """
+        def close(self, **kwargs):
+            return asyncio.sleep(0)
+        
+        def shutdown(self, **kwargs):
+            return super().close(**kwargs)
+    
+    return types.SimpleNamespace(Communicate=edge_tts.Communicate, SharedTCPConnector=SharedTCPConnector)
+
+EDGE_TTS_AVAILABLE = BACKENDS.available("edge_tts")
+if not EDGE_TTS_AVAILABLE:
+    logger.info("Edge TTS not available, using fallback options")
+
+def _make_gemini_model(api_key):
+    """A GenerativeModel bound to ``api_key`` alone
+
+    ``genai.configure`` is process-wide, so the model gets its own client
+    instead of the library's default one.
+    """
+    genai = BACKENDS.get("gemini")
+    clients = genai.ClientManager()
+    clients.configure(api_key=api_key)
+    model = genai.GenerativeModel(GEMINI_MODEL_NAME)
+    if getattr(model, "_client", False) is not None:
+        raise RuntimeError("GenerativeModel no longer takes a per-model client")
+    model._client = clients.get_default_client("generative")
+    return model
+
+# One rate-limited Gemini client per API key, shared by every request using that key
+GEMINI_CLIENTS = GeminiPool(
+    _make_gemini_model,
+    requests_per_minute=GEMINI_REQUESTS_PER_MINUTE,
+    burst=GEMINI_BURST,
+    max_concurrent=GEMINI_MAX_PARALLEL_CALLS,
+    retries=GEMINI_QUOTA_RETRIES,
+    on_event=lambda event: METRICS.gemini_event(event)
+)
+
+def gemini_client(use_gemini, api_key):
+    """The pooled client for ``api_key``, or None when the template script should be used"""
+    if not use_gemini:
+        return None
+    try:
+        return GEMINI_CLIENTS.get(api_key)
+    except Exception as e:
+        logger.error(f"❌ Gemini API error: {e}")
+        return None
 
 def init_gemini(api_key):
-    """Initialize Gemini client with API key"""
-    global client
+    """Check an API key and warm its client in the pool"""
     if api_key and api_key.strip():
         try:
-            genai.configure(api_key=api_key)
-            client = genai.GenerativeModel('gemini-1.5-flash')
+            GEMINI_CLIENTS.get(api_key)
             return "✅ Gemini API connected successfully!"
         except Exception as e:
             return f"❌ Gemini API error: {str(e)}"
     return "ℹ️ Add Gemini API key for AI-powered conversations"
 
-def generate_with_gtts(text, filename):
+def _gtts_cache_key(text, lang=GTTS_LANG, tld=GTTS_TLD):
+    return SEGMENT_CACHE.make_key("gtts", f"{lang}-{tld}", "normal", text)
+
+def _pyttsx3_cache_key(text, gender, slot):
+    # Voice selection is deterministic per host, so it is keyed by policy
+    return SEGMENT_CACHE.make_key("pyttsx3", f"{gender}-{slot}", PYTTSX3_RATE, text)
+
+def _edge_cache_key(text, voice, engine="edge"):
+    # Turns cut from a batched request ("edge-batch") may start by borrowing
+    # bits from the cut-off frames before them, so they never stand in for
+    # single-turn audio, which splice_mp3 assumes starts with a fresh reservoir
+    return SEGMENT_CACHE.make_key(engine, voice, EDGE_TTS_RATE, text)
+
+def generate_with_gtts(text, filename, lang=GTTS_LANG, tld=GTTS_TLD):
     """Generate speech using Google's gTTS"""
+    cache_key = _gtts_cache_key(text, lang, tld)
+    if SEGMENT_CACHE.fetch(cache_key, filename):
+        return filename, None
+    
     try:
-        tts = gTTS(text=text, lang='en', slow=False)
+        tts = BACKENDS.get("gtts")(text=text, lang=lang, tld=tld, slow=False, timeout=GTTS_TIMEOUT_SECONDS)
         tts.save(filename)
+        SEGMENT_CACHE.store(cache_key, filename)
         return filename, None
     except Exception as e:
         return None, f"gTTS Error: {str(e)}"
 
-def generate_with_pyttsx3(text, filename):
-    """Generate speech using system's TTS engine"""
+def generate_with_pyttsx3(text, filename, gender="female", slot=0):
+    """Generate speech using system's TTS engine (on the pre-initialized engine pool)"""
+    cache_key = _pyttsx3_cache_key(text, gender, slot)
+    if SEGMENT_CACHE.fetch(cache_key, filename):
+        return filename, None
+    
     try:
-        engine = pyttsx3.init()
-        engine.setProperty('rate', 180)
-        engine.setProperty('volume', 0.9)
-        
-        voices = engine.getProperty('voices')
-        if voices:
-            for voice in voices:
-                if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-                    engine.setProperty('voice', voice.id)
-                    break
-        
-        engine.save_to_file(text, filename)
-        engine.runAndWait()
+        BACKENDS.get("pyttsx3").render([(text, filename, gender, slot)])
+        SEGMENT_CACHE.store(cache_key, filename)
         return filename, None
     except Exception as e:
         return None, f"pyttsx3 Error: {str(e)}"
 
+# Every request runs its async work on this one long-lived loop
+ASYNC_WORKER = EventLoopWorker()
+
+# Per event loop: (process-wide synthesis semaphore, shared connector)
+_loop_resources = weakref.WeakKeyDictionary()
+
+def _edge_tts_resources():
+    """Synthesis semaphore and shared connector bound to the running loop"""
+    loop = asyncio.get_running_loop()
+    resources = _loop_resources.get(loop)
+    if resources is None:
+        resources = (
+            asyncio.Semaphore(max(1, EDGE_TTS_PROCESS_CONCURRENCY)),
+            BACKENDS.get("edge_tts").SharedTCPConnector(ttl_dns_cache=300)
+        )
+        _loop_resources[loop] = resources
+    return resources
+
+async def _close_loop_resources():
+    resources = _loop_resources.pop(asyncio.get_running_loop(), None)
+    if resources:
+        await resources[1].shutdown()
+
+def shutdown_async_worker():
+    """Close shared sessions and stop the background loop"""
+    if ASYNC_WORKER.is_running:
+        try:
+            ASYNC_WORKER.run(_close_loop_resources(), timeout=5)
+        except Exception as e:
+            logger.warning(f"Error closing shared sessions: {e}")
+        ASYNC_WORKER.shutdown()
+
+atexit.register(shutdown_async_worker)
+
 async def generate_with_edge_tts(text, voice, filename):
-    """Generate speech using Microsoft Edge TTS with specific voice"""
+    """Request speech from Microsoft Edge TTS with a specific voice and cache it
+
+    Cache lookups and the process-wide request limit are up to the caller;
+    TURN_SPEECH applies both before it starts timing the request.
+    """
     if not EDGE_TTS_AVAILABLE:
         return None, "Edge TTS not available"
     
+    # Save as MP3 since that's Edge TTS default format
+    mp3_filename = filename.replace('.wav', '.mp3')
     try:
-        communicate = edge_tts.Communicate(text, voice)
-        # Save as MP3 since that's Edge TTS default format
-        mp3_filename = filename.replace('.wav', '.mp3')
+        _, connector = _edge_tts_resources()
+        communicate = BACKENDS.get("edge_tts").Communicate(text, voice, rate=EDGE_TTS_RATE, connector=connector)
         await communicate.save(mp3_filename)
+        await asyncio.to_thread(SEGMENT_CACHE.store, _edge_cache_key(text, voice), mp3_filename)
         return mp3_filename, None
     except Exception as e:
         return None, f"Edge TTS Error: {str(e)}"
 
-def generate_podcast_script(text, speaker_count, use_gemini):
-    """Generate a podcast script with multiple speakers"""
-    if use_gemini and client:
-        try:
-            voice_config = VOICE_CONFIGS[f"{speaker_count}_speakers"]
-            speaker_names = [config["name"] for config in voice_config]
-            
-            prompt = f"""Create an engaging podcast conversation between {speaker_count} hosts: {', '.join(speaker_names)}.
+async def generate_batch_with_edge_tts(texts, voice, filenames):
+    """Voice several turns of one speaker in a single Edge TTS request
+
+    The turns are sent as one text and cut apart (see mp3_splice.split_mp3)
+    midway through the pause between them, located from the sentence
+    boundaries Edge TTS reports. Writes one MP3 per turn to ``filenames`` and
+    returns ``(spans, None)`` with each turn's ``(start, end)`` in seconds of
+    the request's audio, or ``(None, error)`` when the request failed or the
+    turns could not be told apart.
+    """
+    if not EDGE_TTS_AVAILABLE:
+        return None, "Edge TTS not available"
+    
+    audio = bytearray()
+    boundaries = []
+    try:
+        semaphore, connector = _edge_tts_resources()
+        async with semaphore:
+            communicate = BACKENDS.get("edge_tts").Communicate(
+                batch_text(texts), voice, rate=EDGE_TTS_RATE, connector=connector
+            )
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    audio += chunk["data"]
+                elif chunk["type"] in ("SentenceBoundary", "WordBoundary"):
+                    # Offsets and durations are in 100 ns ticks
+                    start = chunk["offset"] / 1e7
+                    boundaries.append((start, start + chunk["duration"] / 1e7, chunk["text"]))
+    except Exception as e:
+        return None, f"Edge TTS Error: {str(e)}"
+    
+    spans = locate_turns(texts, boundaries)
+    if spans is None:
+        return None, "Could not locate the turns of a batched request"
+    cuts = [(spans[k - 1][1] + spans[k][0]) / 2 for k in range(1, len(spans))]
+    if not split_mp3(bytes(audio), cuts, filenames):
+        return None, "Batched Edge TTS audio is not a splittable MP3 stream"
+    return spans, None
+
+def _speaker_voice(speaker_idx, speaker_count):
+    configs = VOICE_CONFIGS.get(f"{speaker_count}_speakers")
+    if not configs:
+        return VOICE_CONFIGS["2_speakers"][0]
+    return configs[speaker_idx % len(configs)]
+
+def _gtts_accent(speaker_idx):
+    return GTTS_SPEAKER_ACCENTS[speaker_idx % len(GTTS_SPEAKER_ACCENTS)]
+
+def _pyttsx3_voice(speaker_idx, speaker_count):
+    """``(gender, slot)`` of a speaker's pyttsx3 voice"""
+    configs = VOICE_CONFIGS.get(f"{speaker_count}_speakers") or [_speaker_voice(0, speaker_count)]
+    genders = [config["gender"] for config in configs]
+    gender = genders[speaker_idx % len(genders)]
+    return gender, genders[:speaker_idx % len(genders)].count(gender)
+
+async def _cached_segment(cache_key, filename):
+    """``filename`` filled from SEGMENT_CACHE off the event loop, or None on a miss"""
+    return filename if await asyncio.to_thread(SEGMENT_CACHE.fetch, cache_key, filename) else None
+
+async def _edge_turn(text, speaker_idx, speaker_count, filename):
+    return await generate_with_edge_tts(text, _speaker_voice(speaker_idx, speaker_count)["voice"], filename)
+
+async def _edge_cached(text, speaker_idx, speaker_count, filename):
+    return await _cached_segment(_edge_cache_key(text, _speaker_voice(speaker_idx, speaker_count)["voice"]), filename)
+
+async def _gtts_accents_turn(text, speaker_idx, speaker_count, filename):
+    return await run_blocking(generate_with_gtts, text, filename, *_gtts_accent(speaker_idx))
+
+async def _gtts_accents_cached(text, speaker_idx, speaker_count, filename):
+    return await _cached_segment(_gtts_cache_key(text, *_gtts_accent(speaker_idx)), filename)
+
+async def _gtts_turn(text, speaker_idx, speaker_count, filename):
+    return await run_blocking(generate_with_gtts, text, filename)
+
+async def _gtts_cached(text, speaker_idx, speaker_count, filename):
+    return await _cached_segment(_gtts_cache_key(text), filename)
+
+async def _pyttsx3_turn(text, speaker_idx, speaker_count, filename):
+    return await run_blocking(generate_with_pyttsx3, text, filename, *_pyttsx3_voice(speaker_idx, speaker_count))
+
+async def _pyttsx3_cached(text, speaker_idx, speaker_count, filename):
+    return await _cached_segment(_pyttsx3_cache_key(text, *_pyttsx3_voice(speaker_idx, speaker_count)), filename)
+
+# One speaker turn, synthesized with the first engine in TTS_FALLBACK_ORDER that
+# succeeds; keyed like TTS_ENGINE_LABELS. Cache hits are served before any
+# request, so they never count as engine latency
+TTS_BACKENDS = {
+    "edge": TTSBackend("edge", _edge_turn, ".mp3", lambda: EDGE_TTS_AVAILABLE, _edge_cached,
+                       limit=lambda: _edge_tts_resources()[0]),
+    "gtts-accents": TTSBackend("gtts-accents", _gtts_accents_turn, ".mp3", lambda: BACKENDS.available("gtts"),
+                               _gtts_accents_cached),
+    "gtts": TTSBackend("gtts", _gtts_turn, ".mp3", lambda: BACKENDS.available("gtts"), _gtts_cached),
+    "pyttsx3": TTSBackend("pyttsx3", _pyttsx3_turn, ".wav", lambda: BACKENDS.available("pyttsx3"), _pyttsx3_cached),
+}
+TURN_SPEECH = HedgedSpeech(
+    TTS_BACKENDS,
+    TTS_FALLBACK_ORDER,
+    HedgePolicy(
+        timeout=TTS_TIMEOUT_SECONDS,
+        retries=TTS_RETRIES,
+        hedge_percentile=None if TTS_HEDGE_PERCENTILE.lower() == "off" else float(TTS_HEDGE_PERCENTILE),
+    ),
+    # Looked up per event so a replaced METRICS is honoured
+    on_event=lambda event, engine: METRICS.tts_event(event, engine),
+)
+
+class SegmentSynthesisError(Exception):
+    """Raised inside a synthesis task when one speaker turn fails"""
+    def __init__(self, speaker_name, error):
+        super().__init__(f"{speaker_name}: {error}")
+        self.speaker_name = speaker_name
+        self.error = error
+
+def build_script_prompt(text, speaker_count):
+    """Build the Gemini prompt for a podcast conversation"""
+    voice_config = VOICE_CONFIGS[f"{speaker_count}_speakers"]
+    speaker_names = [config["name"] for config in voice_config]
+    
+    return f"""Create an engaging podcast conversation between {speaker_count} hosts: {', '.join(speaker_names)}.
             
             Transform this text into a natural conversation where each speaker contributes meaningfully.
             
@@ -116,14 +513,304 @@ def generate_podcast_script(text, speaker_count, use_gemini):
             {speaker_names[0]}: [text]
             {speaker_names[1] if len(speaker_names) > 1 else speaker_names[0]}: [text]
             etc."""
+
+def fallback_script(text):
+    """Script used when AI generation is disabled or unavailable"""
+    return text[:1500] + ("..." if len(text) > 1500 else "")
+
+def split_document(text, max_chars=LONG_FORM_CHUNK_CHARS):
+    """Split text into chunks of at most ``max_chars`` on paragraph boundaries"""
+    chunks = []
+    current = ""
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        pieces = [paragraph] if len(paragraph) <= max_chars else split_at_sentences(paragraph, max_chars)
+        for piece in pieces:
+            if current and len(current) + 2 + len(piece) > max_chars:
+                chunks.append(current)
+                current = piece
+            else:
+                current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def build_segment_prompt(chunk, speaker_count, index, total):
+    """Build the Gemini prompt for one segment of a long-form episode"""
+    if total == 1:
+        return build_script_prompt(chunk, speaker_count)
+    
+    voice_config = VOICE_CONFIGS[f"{speaker_count}_speakers"]
+    speaker_names = [config["name"] for config in voice_config]
+    if index == 0:
+        position = "the OPENING segment: welcome listeners and introduce the topic, but do not say goodbye"
+    elif index == total - 1:
+        position = "the CLOSING segment: continue from the previous segment, then wrap up and say goodbye"
+    else:
+        position = "a MIDDLE segment: continue the ongoing discussion with no greetings or sign-offs"
+    
+    return f"""You are writing segment {index + 1} of {total} of one podcast conversation between {speaker_count} hosts: {', '.join(speaker_names)}.
+            
+            This is {position}.
+            
+            Guidelines:
+            - Make it sound like a real podcast discussion
+            - Each speaker should have distinct perspectives
+            - Cover the material below faithfully; other segments cover the rest of the document
+            - Keep it under 2000 characters total
+            - Only use these speaker names, exactly as written: {', '.join(speaker_names)}
+            
+            Material for this segment: {chunk}
             
-            response = client.generate_content(prompt)
+            Format the output with clear speaker labels like:
+            {speaker_names[0]}: [text]
+            {speaker_names[1] if len(speaker_names) > 1 else speaker_names[0]}: [text]
+            etc."""
+
+def normalize_speaker_labels(script, speaker_count):
+    """Rewrite label variants such as ``**Sarah:**`` to the canonical ``Sarah:``"""
+    voice_config = VOICE_CONFIGS[f"{speaker_count}_speakers"]
+    names = "|".join(re.escape(config["name"]) for config in voice_config)
+    label = re.compile(rf'^[ \t>*_#-]*({names})[ \t*_]*:[ \t*_]*', re.IGNORECASE | re.MULTILINE)
+    canonical = {config["name"].lower(): config["name"] for config in voice_config}
+    return label.sub(lambda m: f"{canonical[m.group(1).lower()]}: ", script)
+
+def _generate_segment_script(gemini, chunk, speaker_count, index, total, failures):
+    try:
+        response = gemini.generate_content(build_segment_prompt(chunk, speaker_count, index, total))
+        return normalize_speaker_labels(response.text, speaker_count)
+    except Exception as e:
+        logger.error(f"❌ Segment {index + 1}/{total} generation failed: {e}")
+        failures.append(index)
+        # Keep the material in the episode rather than dropping it
+        first_speaker = _speaker_voice(0, speaker_count)["name"]
+        return f"{first_speaker}: {' '.join(chunk.split())}"
+
+def iter_long_form_script(text, speaker_count, gemini, failures=None):
+    """Map-reduce script generation for documents of any length
+
+    The document is split on paragraph boundaries, every chunk is turned into
+    a segment script by parallel calls on the ``gemini`` client (which rate
+    limits them per API key), and segments are
+    yielded in document order as soon as they and all earlier ones are done.
+    Indexes of segments that fell back to their source text are appended to
+    ``failures``.
+    """
+    if failures is None:
+        failures = []
+    if gemini is None or speaker_count < 2:
+        # Fallback, and solo narration (no conversation to script): the whole text, no truncation
+        yield text
+        return
+    
+    chunks = split_document(text)
+    logger.info(f"Long-form mode: {len(chunks)} segments from {len(text)} characters")
+    with ThreadPoolExecutor(max_workers=GEMINI_MAX_PARALLEL_CALLS) as pool:
+        futures = [
+            pool.submit(_generate_segment_script, gemini, chunk, speaker_count, i, len(chunks), failures)
+            for i, chunk in enumerate(chunks)
+        ]
+        for future in futures:
+            yield future.result().strip() + "\n"
+
+def _cached_script(text, speaker_count, gemini, long_form, refresh):
+    """Return (cache_key, cached_script) for an AI-generated script request"""
+    if gemini is None:
+        # Fallback scripts are free to rebuild
+        return None, None
+    cache_key = SCRIPT_CACHE.make_key(text, speaker_count, GEMINI_MODEL_NAME, SCRIPT_PROMPT_VERSION, long_form)
+    if refresh:
+        return cache_key, None
+    cached = SCRIPT_CACHE.get(cache_key)
+    if cached is not None:
+        logger.info("📜 Reusing cached script")
+    return cache_key, cached
+
+def generate_podcast_script(text, speaker_count, gemini, long_form=False, refresh=False):
+    """Generate a podcast script with multiple speakers
+
+    ``gemini`` is a pooled client (see gemini_client); None uses the template.
+    ``long_form`` covers the whole document via iter_long_form_script instead
+    of only its first 2500 characters. Gemini scripts are served from
+    SCRIPT_CACHE unless ``refresh`` forces a fresh generation.
+    """
+    cache_key, cached = _cached_script(text, speaker_count, gemini, long_form, refresh)
+    if cached is not None:
+        return cached
+    
+    if long_form:
+        failures = []
+        script = "".join(iter_long_form_script(text, speaker_count, gemini, failures))
+        if cache_key and not failures:
+            SCRIPT_CACHE.put(cache_key, script)
+        return script
+    
+    if gemini is not None:
+        try:
+            response = gemini.generate_content(build_script_prompt(text, speaker_count))
+            SCRIPT_CACHE.put(cache_key, response.text)
             return response.text
         except Exception as e:
             return f"AI generation failed: {str(e)}. Using original text."
     
     # Fallback: simple text with speaker distribution
-    return text[:1500] + ("..." if len(text) > 1500 else "")
+    return fallback_script(text)
+
+def stream_podcast_script(text, speaker_count, gemini, long_form=False, refresh=False):
+    """Yield the podcast script in chunks as Gemini streams it
+
+    In ``long_form`` mode whole segments are yielded in order as they finish.
+    A cached script (see generate_podcast_script) is yielded in one piece.
+    """
+    cache_key, cached = _cached_script(text, speaker_count, gemini, long_form, refresh)
+    if cached is not None:
+        yield cached
+        return
+    
+    if long_form:
+        failures = []
+        segments = []
+        for segment in iter_long_form_script(text, speaker_count, gemini, failures):
+            segments.append(segment)
+            yield segment
+        if cache_key and not failures:
+            SCRIPT_CACHE.put(cache_key, "".join(segments))
+        return
+    
+    if gemini is not None:
+        chunks = []
+        try:
+            for chunk in gemini.stream_content(build_script_prompt(text, speaker_count)):
+                try:
+                    chunk_text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. safety metadata)
+                    continue
+                if chunk_text:
+                    chunks.append(chunk_text)
+                    yield chunk_text
+        except Exception as e:
+            if chunks:
+                raise
+            yield f"AI generation failed: {str(e)}. Using original text."
+            return
+        if chunks:
+            SCRIPT_CACHE.put(cache_key, "".join(chunks))
+        return
+    
+    yield fallback_script(text)
+
+class ScriptTurnParser:
+    """Incremental version of the speaker-label pass in parse_script_for_speakers
+
+    Feed script text as it streams in; each ``Name:`` turn is returned as soon
+    as the next label closes it. ``close()`` flushes the final turn.
+    """
+    def __init__(self, speaker_count):
+        voice_config = VOICE_CONFIGS[f"{speaker_count}_speakers"]
+        self.speaker_count = speaker_count
+        self.speaker_names = [config["name"] for config in voice_config]
+        self.emitted = 0
+        self._chunks = []
+        self._pending = ""
+        self._current_speaker = 0
+        self._current_text = ""
+    
+    @property
+    def script(self):
+        """Everything fed so far"""
+        return "".join(self._chunks)
+    
+    def _take_line(self, line, turns):
+        line = line.strip()
+        if not line:
+            return
+        
+        # Check if line starts with a speaker name
+        for i, name in enumerate(self.speaker_names):
+            if line.lower().startswith(f"{name.lower()}:"):
+                if self._current_text.strip():
+                    turns.append((self._current_text.strip(), self._current_speaker))
+                self._current_speaker = i
+                self._current_text = line[len(name)+1:].strip()
+                return
+        
+        self._current_text += " " + line
+    
+    def feed(self, chunk):
+        """Consume a chunk of script and return the turns it completed"""
+        self._chunks.append(chunk)
+        *lines, self._pending = (self._pending + chunk).split('\n')
+        turns = []
+        for line in lines:
+            self._take_line(line, turns)
+        
+        # A label at the start of the unfinished line already closes the open turn
+        pending = self._pending.strip().lower()
+        if self._current_text.strip() and any(
+            pending.startswith(f"{name.lower()}:") for name in self.speaker_names
+        ):
+            turns.append((self._current_text.strip(), self._current_speaker))
+            self._current_text = ""
+        
+        self.emitted += len(turns)
+        return turns
+    
+    def close(self):
+        """Flush the trailing line and the last open turn"""
+        turns = []
+        self._take_line(self._pending, turns)
+        self._pending = ""
+        if self._current_text.strip():
+            turns.append((self._current_text.strip(), self._current_speaker))
+        self._current_text = ""
+        self.emitted += len(turns)
+        return turns
+
+async def stream_script_turns(script_chunks, parser, script_engine="gemini"):
+    """Yield (text, speaker_idx) turns while ``script_chunks`` is still streaming
+
+    ``script_chunks`` is a (blocking) iterator such as stream_podcast_script;
+    it is advanced on a worker thread so synthesis keeps running meanwhile.
+    Time spent waiting for chunks is recorded as the "script" stage.
+    """
+    loop = asyncio.get_running_loop()
+    iterator = iter(script_chunks)
+    # A cancelled read keeps running on its thread; close() must wait for it
+    step = threading.Lock()
+
+    def advance():
+        with step:
+            return next(iterator, None)
+
+    def close():
+        with step:
+            getattr(iterator, "close", lambda: None)()
+
+    waited = 0.0
+    try:
+        while True:
+            start = time.perf_counter()
+            chunk = await loop.run_in_executor(None, advance)
+            waited += time.perf_counter() - start
+            if chunk is None:
+                break
+            for turn in parser.feed(chunk):
+                yield turn
+    finally:
+        # Releases the Gemini slot the stream holds when the run is cancelled or fails
+        await loop.run_in_executor(None, close)
+    METRICS.record("script", waited, script_engine, parser.speaker_count, len(parser.script))
+    
+    streamed = parser.emitted
+    turns = parser.close()
+    if not streamed and len(turns) < 2:
+        # No usable speaker labels: fall back to sentence distribution
+        turns = parse_script_for_speakers(parser.script, parser.speaker_count)
+    for turn in turns:
+        yield turn
 
 def parse_script_for_speakers(script, speaker_count):
     """Parse the script to extract speaker parts"""
@@ -131,37 +818,13 @@ def parse_script_for_speakers(script, speaker_count):
         voice_config = VOICE_CONFIGS[f"{speaker_count}_speakers"]
         speaker_names = [config["name"] for config in voice_config]
         
-        parts = []
-        lines = script.split('\n')
-        current_speaker = 0
-        current_text = ""
-        
         # First, try to find explicit speaker labels
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Check if line starts with a speaker name
-            speaker_found = False
-            for i, name in enumerate(speaker_names):
-                if line.lower().startswith(f"{name.lower()}:"):
-                    if current_text.strip():
-                        parts.append((current_text.strip(), current_speaker))
-                    current_speaker = i
-                    current_text = line[len(name)+1:].strip()
-                    speaker_found = True
-                    break
-            
-            if not speaker_found:
-                current_text += " " + line
-        
-        if current_text.strip():
-            parts.append((current_text.strip(), current_speaker))
+        parser = ScriptTurnParser(speaker_count)
+        parts = parser.feed(script) + parser.close()
         
         # If no explicit speakers were found, intelligently distribute text
         if not parts or len(parts) < 2:
-            print(f"No explicit speakers found, distributing text among {speaker_count} speakers")
+            logger.debug(f"No explicit speakers found, distributing text among {speaker_count} speakers")
             parts = []
             
             # Split into sentences and distribute
@@ -197,7 +860,7 @@ def parse_script_for_speakers(script, speaker_count):
                         if speaker_sentences:
                             speaker_text = ' '.join(speaker_sentences)
                             parts.append((speaker_text, i))
-                            print(f"Speaker {speaker_names[i]}: {len(speaker_sentences)} sentences")
+                            logger.debug(f"Speaker {speaker_names[i]}: {len(speaker_sentences)} sentences")
                         
                         start_idx = end_idx
             else:
@@ -210,155 +873,678 @@ def parse_script_for_speakers(script, speaker_count):
         if not parts:
             parts = [(script, 0)]
         
-        # Print debug info
-        print(f"Generated {len(parts)} parts for {speaker_count} speakers:")
-        for i, (text, speaker_idx) in enumerate(parts):
-            speaker_name = speaker_names[speaker_idx]
-            print(f"  Part {i+1}: {speaker_name} - {text[:60]}...")
+        logger.info(f"Generated {len(parts)} parts for {speaker_count} speakers")
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, (text, speaker_idx) in enumerate(parts):
+                logger.debug(f"  Part {i+1}: {speaker_names[speaker_idx]} - {text[:60]}...")
         
         return parts
         
     except Exception as e:
-        print(f"Error parsing script: {e}")
+        logger.error(f"Error parsing script: {e}")
         return [(script, 0)]
 
-async def generate_multi_speaker_audio(script_parts, speaker_count):
-    """Generate multi-speaker podcast audio"""
+async def _iterate_turns(script_parts):
+    """Iterate a list or async iterator of (text, speaker_idx) turns"""
+    if hasattr(script_parts, "__aiter__"):
+        async for part in script_parts:
+            yield part
+    else:
+        for part in script_parts:
+            yield part
+
+def _remove_files(filenames):
+    for f in filenames:
+        try:
+            os.unlink(f)
+        except:
+            pass
+
+def _read_file(filename):
+    with open(filename, 'rb') as f:
+        return f.read()
+
+async def iter_multi_speaker_turns(script_parts, speaker_count, max_concurrency=EDGE_TTS_MAX_CONCURRENCY):
+    """Synthesize speaker turns concurrently and yield them in script order
+
+    ``script_parts`` is a list of (text, speaker_idx) turns or an async
+    iterator of them (see stream_script_turns); streamed turns start
+    synthesizing as soon as they arrive. At most ``max_concurrency`` Edge TTS
+    requests are in flight. Each turn goes through TURN_SPEECH: slow requests
+    are hedged, failed ones retried and then handed to the next engine in
+    TTS_FALLBACK_ORDER, so turns may come back as MP3 or WAV. Yields
+    ``(index, speaker_name, filename, part)`` as soon as a turn and every
+    turn before it are ready, ``part`` being the ``(text, speaker_idx)`` it
+    voiced; yielded files belong to the caller. A turn that no engine could
+    render cancels the rest and is raised as SegmentSynthesisError.
+    """
+    voice_config = VOICE_CONFIGS[f"{speaker_count}_speakers"]
+    semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+    started = time.perf_counter()
+    first_ready = []
+    turns = []
+    tasks = []
+    # Set whenever a turn is queued or finishes, or the script source ends
+    changed = asyncio.Event()
+    
+    if isinstance(script_parts, list):
+        logger.info(f"Generating audio for {len(script_parts)} parts with {speaker_count} speakers")
+    else:
+        logger.info(f"Generating audio for streamed parts with {speaker_count} speakers")
+    
+    async def synthesize_turn(i, speaker_text, speaker_idx, voice, speaker_name, temp_base):
+        async with semaphore:
+            logger.debug(f"Part {i+1}: {speaker_name} ({voice}) says: {speaker_text[:50]}...")
+            with METRICS.span("synthesis", "edge", speaker_count, len(speaker_text)) as span:
+                result, error, engine = await TURN_SPEECH.synthesize(
+                    speaker_text, speaker_idx, speaker_count, temp_base
+                )
+                span.engine = engine or span.engine
+                if not result:
+                    raise SegmentSynthesisError(speaker_name, error)
+        if not first_ready:
+            first_ready.append(time.perf_counter() - started)
+            logger.info(f"⏱️ First audio ready after {first_ready[0]:.2f}s")
+        logger.debug(f"✅ Generated audio for {speaker_name}")
+        return result
+    
+    def failed_task():
+        return next(
+            (task for task in tasks
+             if task.done() and not task.cancelled() and task.exception()),
+            None
+        )
+    
+    async def produce():
+        async for speaker_text, speaker_idx in _iterate_turns(script_parts):
+            i = len(turns)
+            voice = voice_config[speaker_idx]["voice"]
+            speaker_name = voice_config[speaker_idx]["name"]
+            # Each engine attempt appends its own suffix and extension
+            temp_base = ARTIFACTS.scratch_path(f"temp_speaker_{i}_{speaker_name}_{uuid4().hex[:8]}")
+            turn = (i, speaker_text, speaker_idx, voice, speaker_name, temp_base)
+            turns.append(turn)
+            task = asyncio.ensure_future(synthesize_turn(*turn))
+            task.add_done_callback(lambda _: changed.set())
+            tasks.append(task)
+            changed.set()
+            if failed_task():
+                # Stop pulling more script once a turn has failed
+                break
+    
+    producer = asyncio.ensure_future(produce())
+    producer.add_done_callback(lambda _: changed.set())
+    next_index = 0
+    try:
+        while True:
+            failed = failed_task()
+            if failed is not None:
+                raise failed.exception()
+            if producer.done() and not producer.cancelled() and producer.exception():
+                raise producer.exception()
+            if next_index < len(tasks) and tasks[next_index].done():
+                turn = turns[next_index]
+                next_index += 1
+                yield turn[0], turn[4], tasks[next_index - 1].result(), (turn[1], turn[2])
+                continue
+            if producer.done() and next_index >= len(tasks):
+                break
+            # Nothing can change between the checks above and clear(): no await
+            changed.clear()
+            await changed.wait()
+    finally:
+        # Runs on failure, cancellation or an early exit by the caller
+        pending = [task for task in tasks + [producer] if not task.done()]
+        for task in pending:
+            task.cancel()
+        # Gathering also retrieves the exceptions of tasks that failed alongside
+        await asyncio.gather(*tasks, producer, return_exceptions=True)
+        # Finished turns not yet handed to the caller; cancelled ones clean up after themselves
+        _remove_files(task.result() for task in tasks[next_index:]
+                      if not task.cancelled() and task.exception() is None)
+
+async def iter_batched_turns(script_parts, speaker_count, max_concurrency=EDGE_TTS_MAX_CONCURRENCY,
+                             batch_chars=None):
+    """Batched counterpart of iter_multi_speaker_turns for a list of turns
+
+    Turns found in SEGMENT_CACHE (single-turn audio first, then pieces of
+    earlier batched requests) are used as they are; the rest are grouped
+    per speaker (see turn_planner.batch_turns) and every group is voiced in
+    one Edge TTS request, then cut back into turns. A group that fails or
+    cannot be cut is voiced turn by turn through TURN_SPEECH instead. Yields
+    the same ``(index, speaker_name, filename, part)`` tuples in script order.
+    """
+    voice_config = VOICE_CONFIGS[f"{speaker_count}_speakers"]
+    semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+    voices = [voice_config[speaker_idx]["voice"] for _, speaker_idx in script_parts]
+    cache_keys = [_edge_cache_key(text, voice, "edge-batch") for (text, _), voice in zip(script_parts, voices)]
+    files = [ARTIFACTS.scratch_path(f"temp_speaker_{i}_{uuid4().hex[:8]}.mp3") for i in range(len(script_parts))]
+    
+    def fetch(i):
+        return (SEGMENT_CACHE.fetch(_edge_cache_key(script_parts[i][0], voices[i]), files[i])
+                or SEGMENT_CACHE.fetch(cache_keys[i], files[i]))
+    
+    # Cache I/O runs off the shared event loop
+    hits = await asyncio.to_thread(lambda: [fetch(i) for i in range(len(files))])
+    files = [filename if hit else None for filename, hit in zip(files, hits)]
+    pending = [i for i, hit in enumerate(hits) if not hit]
+    batches = [
+        (speaker_idx, [pending[j] for j in indices])
+        for speaker_idx, indices in batch_turns([script_parts[i] for i in pending], batch_chars or TTS_BATCH_CHARS)
+    ]
+    logger.info(f"Voicing {len(pending)} of {len(script_parts)} parts in {len(batches)} batched requests")
+    
+    async def synthesize_batch(speaker_idx, indices):
+        voice = voice_config[speaker_idx]["voice"]
+        texts = [script_parts[i][0] for i in indices]
+        filenames = [ARTIFACTS.scratch_path(f"temp_speaker_{i}_{uuid4().hex[:8]}.mp3") for i in indices]
+        async with semaphore:
+            with METRICS.span("synthesis", "edge-batch", speaker_count, sum(map(len, texts))):
+                spans, error = await generate_batch_with_edge_tts(texts, voice, filenames)
+        if spans is None:
+            _remove_files(filenames)
+            METRICS.tts_event("batch_fallback", "edge")
+            logger.warning(f"↪️ Batched request failed ({error}), voicing its {len(indices)} turns one by one")
+            return await _synthesize_changed_turns(
+                [(i, script_parts[i][0], speaker_idx) for i in indices], speaker_count, TTS_FALLBACK_ORDER,
+                max_concurrency
+            )
+        logger.debug(f"Batch for {voice}: " + ", ".join(
+            f"turn {i + 1} {start:.2f}-{end:.2f}s" for i, (start, end) in zip(indices, spans)
+        ))
+        await asyncio.to_thread(
+            lambda: [SEGMENT_CACHE.store(cache_keys[i], filename) for i, filename in zip(indices, filenames)]
+        )
+        return dict(zip(indices, filenames))
+    
+    tasks = [asyncio.ensure_future(synthesize_batch(*batch)) for batch in batches]
+    next_index = 0
+    try:
+        finished = asyncio.as_completed(tasks)
+        while True:
+            while next_index < len(files) and files[next_index] is not None:
+                speaker_text, speaker_idx = script_parts[next_index]
+                next_index += 1
+                yield next_index - 1, voice_config[speaker_idx]["name"], files[next_index - 1], (
+                    speaker_text, speaker_idx
+                )
+            if next_index >= len(files):
+                break
+            for i, filename in (await next(finished)).items():
+                files[i] = filename
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for task in tasks:
+            if not task.cancelled() and task.exception() is None:
+                for i, filename in task.result().items():
+                    files[i] = filename
+        # Turns not handed to the caller
+        _remove_files(filename for filename in files[next_index:] if filename)
+
+def combine_turn_files(audio_files, gap_ms=SPEAKER_GAP_MS, output_format=OUTPUT_FORMAT):
+    """Assemble synthesized turn files into one episode and delete the parts"""
+    extension = OUTPUT_FORMATS[output_format][2]
+    if len(audio_files) == 1 and audio_files[0].lower().endswith(extension):
+        # Single audio file already in the right format, just return it
+        return audio_files[0]
+    
+    logger.debug(f"Combining {len(audio_files)} audio files...")
+    
+    # With post-processing the episode is leveled and mixed in one buffer;
+    # otherwise MP3 segments are spliced as-is when possible, and anything
+    # else is decoded once and streamed into the output file
+    output_filename = ARTIFACTS.scratch_path(f"combined_podcast_{uuid4().hex[:8]}{extension}")
+    try:
+        if POST_PROCESS.active:
+            process_episode(audio_files, output_filename, output_format, gap_ms, POST_PROCESS)
+        else:
+            assemble_episode(audio_files, output_filename, output_format, gap_ms)
+    finally:
+        # Cleanup temporary files
+        for f in audio_files:
+            try:
+                os.unlink(f)
+                logger.debug(f"🗑️ Cleaned up {f}")
+            except:
+                pass
+    
+    logger.info(f"✅ Combined audio saved as {output_filename}")
+    return output_filename
+
+async def generate_multi_speaker_audio(script_parts, speaker_count, max_concurrency=EDGE_TTS_MAX_CONCURRENCY,
+                                       gap_ms=SPEAKER_GAP_MS, output_format=OUTPUT_FORMAT, render_id=None,
+                                       batched=None):
+    """Generate multi-speaker podcast audio
+
+    Turns are synthesized by iter_multi_speaker_turns (concurrently, streamed
+    turns as they arrive), or by iter_batched_turns when ``batched`` (default
+    TTS_BATCHED) and the turns are a list, and reassembled in script order
+    with ``gap_ms`` of silence between speakers, written as ``output_format``.
+    With ``render_id`` the turns are kept in RENDERS for rerender_podcast.
+    """
     if not EDGE_TTS_AVAILABLE:
         return None, "Edge TTS not available for multi-speaker"
     
+    audio_files = []
+    turns = []
     try:
-        voice_config = VOICE_CONFIGS[f"{speaker_count}_speakers"]
-        audio_files = []
-        
-        print(f"Generating audio for {len(script_parts)} parts with {speaker_count} speakers")
-        
-        for i, (speaker_text, speaker_idx) in enumerate(script_parts):
-            voice = voice_config[speaker_idx]["voice"]
-            speaker_name = voice_config[speaker_idx]["name"]
-            temp_filename = f"temp_speaker_{i}_{speaker_name}_{uuid4().hex[:8]}.mp3"
-            
-            print(f"Part {i+1}: {speaker_name} ({voice}) says: {speaker_text[:50]}...")
-            
-            result, error = await generate_with_edge_tts(speaker_text, voice, temp_filename)
-            if result:
-                audio_files.append(temp_filename)
-                print(f"✅ Generated audio for {speaker_name}")
-            else:
-                print(f"❌ Error generating voice for {speaker_name}: {error}")
-                # Cleanup and return error
-                for f in audio_files:
-                    try:
-                        os.unlink(f)
-                    except:
-                        pass
-                return None, f"Error generating voice for {speaker_name}: {error}"
-        
-        # Combine all audio files
-        if len(audio_files) > 1:
-            print(f"Combining {len(audio_files)} audio files...")
-            combined_audio = AudioSegment.empty()
-            
-            for i, audio_file in enumerate(audio_files):
-                try:
-                    # Load the audio segment - auto-detect format
-                    segment = AudioSegment.from_file(audio_file)
-                    
-                    # Add the segment to combined audio
-                    combined_audio += segment
-                    
-                    # Add a small pause between speakers (0.5 seconds)
-                    if i < len(audio_files) - 1:  # Don't add pause after last segment
-                        pause = AudioSegment.silent(duration=500)  # 500ms pause
-                        combined_audio += pause
-                    
-                    print(f"✅ Added segment {i+1}")
-                except Exception as e:
-                    print(f"❌ Error processing audio file {audio_file}: {e}")
-            
-            # Save combined audio
-            output_filename = f"combined_podcast_{uuid4().hex[:8]}.wav"
-            combined_audio.export(output_filename, format="wav")
-            
-            # Cleanup temporary files
-            for f in audio_files:
-                try:
-                    os.unlink(f)
-                    print(f"🗑️ Cleaned up {f}")
-                except:
-                    pass
-            
-            print(f"✅ Combined audio saved as {output_filename}")
-            return output_filename, None
-            
-        elif len(audio_files) == 1:
-            # Single audio file, just return it
-            return audio_files[0], None
+        if (TTS_BATCHED if batched is None else batched) and isinstance(script_parts, list):
+            turn_files = iter_batched_turns(script_parts, speaker_count, max_concurrency)
         else:
-            return None, "No audio files generated"
+            turn_files = iter_multi_speaker_turns(script_parts, speaker_count, max_concurrency)
+        async for _, _, filename, (speaker_text, speaker_idx) in turn_files:
+            audio_files.append(filename)
+            turns.append((speaker_text, speaker_idx, [filename]))
         
+        if not audio_files:
+            return None, "No audio files generated"
+        RENDERS.save(render_id, "edge", speaker_count, turns, gap_ms)
+        with METRICS.span("assembly", "edge", speaker_count):
+            gaps = turn_gaps([(text, speaker_idx) for text, speaker_idx, _ in turns], gap_ms)
+            return combine_turn_files(audio_files, gaps, output_format), None
+    
+    except SegmentSynthesisError as failure:
+        _remove_files(audio_files)
+        logger.error(f"❌ Error generating voice for {failure.speaker_name}: {failure.error}")
+        return None, f"Error generating voice for {failure.speaker_name}: {failure.error}"
     except Exception as e:
-        print(f"❌ Multi-speaker generation error: {str(e)}")
+        _remove_files(audio_files)
+        logger.error(f"❌ Multi-speaker generation error: {str(e)}")
         return None, f"Multi-speaker generation error: {str(e)}"
 
-def create_podcast(text, use_gemini, tts_engine, speaker_count, progress=gr.Progress()):
-    """Main function to create podcast from text with multiple speakers"""
+def generate_multi_speaker_pyttsx3(script_parts, speaker_count, gap_ms=SPEAKER_GAP_MS, output_format=OUTPUT_FORMAT,
+                                   render_id=None):
+    """Generate offline multi-speaker audio on the pyttsx3 engine pool
+
+    Every part is rendered in parallel with a system voice matching its
+    speaker's gender; speakers that share a gender get different voices when
+    the system has enough of them. Parts are assembled like Edge TTS turns.
+    """
+    if speaker_count > 1:
+        genders = [config["gender"] for config in VOICE_CONFIGS[f"{speaker_count}_speakers"]]
+    else:
+        genders = ["female"]
+    
+    audio_files = []
+    jobs = []
+    cache_keys = []
+    for i, (speaker_text, speaker_idx) in enumerate(script_parts):
+        gender = genders[speaker_idx]
+        slot = genders[:speaker_idx].count(gender)
+        temp_filename = ARTIFACTS.scratch_path(f"temp_speaker_{i}_{uuid4().hex[:8]}.wav")
+        audio_files.append(temp_filename)
+        cache_key = _pyttsx3_cache_key(speaker_text, gender, slot)
+        if not SEGMENT_CACHE.fetch(cache_key, temp_filename):
+            jobs.append((speaker_text, temp_filename, gender, slot))
+            cache_keys.append(cache_key)
+    
+    if not audio_files:
+        return None, "No audio files generated"
+    
+    try:
+        pool = BACKENDS.get("pyttsx3")
+        logger.info(f"Rendering {len(jobs)} of {len(audio_files)} parts on {pool.workers} pyttsx3 workers")
+        for job, (_, seconds) in zip(jobs, pool.render(jobs)):
+            METRICS.record("synthesis", seconds, "pyttsx3", speaker_count, len(job[0]))
+        for cache_key, job in zip(cache_keys, jobs):
+            SEGMENT_CACHE.store(cache_key, job[1])
+        RENDERS.save(render_id, "pyttsx3", speaker_count, [
+            (speaker_text, speaker_idx, [filename])
+            for (speaker_text, speaker_idx), filename in zip(script_parts, audio_files)
+        ], gap_ms)
+        with METRICS.span("assembly", "pyttsx3", speaker_count):
+            return combine_turn_files(audio_files, turn_gaps(script_parts, gap_ms), output_format), None
+    except Exception as e:
+        _remove_files(audio_files)
+        logger.error(f"❌ pyttsx3 generation error: {str(e)}")
+        return None, f"pyttsx3 Error: {str(e)}"
+
+def generate_multi_speaker_gtts(script_parts, speaker_count, gap_ms=SPEAKER_GAP_MS, accents=True,
+                                output_format=OUTPUT_FORMAT, render_id=None):
+    """Generate gTTS audio with every turn (and piece of a long turn) fetched in parallel
+
+    gTTS fetches the pieces of one text sequentially, so turns longer than
+    GTTS_PIECE_CHARS are split at sentence boundaries and all pieces go to a
+    thread pool. With ``accents`` each speaker gets its own accent from
+    GTTS_SPEAKER_ACCENTS and turns are separated by ``gap_ms``; without it
+    the script is read in one voice with no pauses, like a single gTTS call.
+    """
+    pieces = []
+    gaps = []
+    turns = []
+    previous_speaker = None
+    for i, (speaker_text, speaker_idx) in enumerate(script_parts):
+        lang, tld = GTTS_SPEAKER_ACCENTS[speaker_idx % len(GTTS_SPEAKER_ACCENTS)] if accents else (GTTS_LANG, GTTS_TLD)
+        if len(speaker_text) > GTTS_PIECE_CHARS:
+            chunks = split_at_sentences(speaker_text, GTTS_PIECE_CHARS)
+        else:
+            chunks = [speaker_text]
+        for j, chunk in enumerate(chunks):
+            if pieces:
+                gaps.append(gap_ms if accents and j == 0 and speaker_idx != previous_speaker else 0)
+            temp_filename = ARTIFACTS.scratch_path(f"temp_speaker_{i}_{j}_{uuid4().hex[:8]}.mp3")
+            pieces.append((chunk, temp_filename, lang, tld))
+        turns.append((speaker_text, speaker_idx, [piece[1] for piece in pieces[-len(chunks):]]))
+        previous_speaker = speaker_idx
+    
+    if not pieces:
+        return None, "No audio files generated"
+    
+    engine = "gtts-accents" if accents else "gtts"
+    
+    def fetch(piece):
+        with METRICS.span("synthesis", engine, speaker_count, len(piece[0])):
+            return generate_with_gtts(*piece)
+    
+    logger.info(f"Fetching {len(pieces)} gTTS pieces for {len(script_parts)} parts")
+    with ThreadPoolExecutor(max_workers=min(GTTS_MAX_WORKERS, len(pieces))) as pool:
+        results = list(pool.map(fetch, pieces))
+    
+    audio_files = [piece[1] for piece in pieces]
+    error = next((error for _, error in results if error), None)
+    if error:
+        _remove_files(audio_files)
+        return None, error
+    
+    try:
+        RENDERS.save(render_id, engine, speaker_count, turns, gap_ms if accents else 0)
+        with METRICS.span("assembly", engine, speaker_count):
+            return combine_turn_files(audio_files, gaps, output_format), None
+    except Exception as e:
+        _remove_files(audio_files)
+        return None, f"gTTS Error: {str(e)}"
+
+async def stream_podcast(text, use_gemini, speaker_count, pipelined=True, gap_ms=SPEAKER_GAP_MS,
+                         long_form=False, refresh_script=False, output_format=OUTPUT_FORMAT, api_key=None):
+    """Edge TTS podcast generation that reports every turn as it is voiced
+
+    Yields ``("turn", index, speaker_name, audio_bytes)`` as soon as a turn and
+    every turn before it are synthesized, then finishes with either
+    ``("done", episode_path, script)`` or ``("error", message, script)``.
+    """
+    audio_files = []
+    turns = []
+    podcast_script = ""
+    parser = None
+    render_id = uuid4().hex[:8]
+    # Runs on the shared loop: anything that blocks (the first client for a
+    # key imports google.generativeai, file I/O) goes to a thread
+    gemini = await asyncio.to_thread(gemini_client, use_gemini, api_key)
+    try:
+        if pipelined:
+            parser = ScriptTurnParser(speaker_count)
+            script_parts = stream_script_turns(
+                stream_podcast_script(text, speaker_count, gemini, long_form, refresh_script), parser,
+                _script_engine(gemini)
+            )
+        else:
+            with METRICS.span("script", _script_engine(gemini), speaker_count, len(text)):
+                podcast_script = await asyncio.to_thread(
+                    generate_podcast_script, text, speaker_count, gemini, long_form, refresh_script
+                )
+            with METRICS.span("parse", "edge", speaker_count, len(podcast_script)):
+                script_parts = plan_turns(
+                    parse_script_for_speakers(podcast_script, speaker_count), TURN_TARGET_CHARS, TURN_MAX_CHARS
+                )
+        
+        async for index, speaker_name, filename, (speaker_text, speaker_idx) in iter_multi_speaker_turns(
+                script_parts, speaker_count):
+            audio_files.append(filename)
+            turns.append((speaker_text, speaker_idx, [filename]))
+            audio_bytes = await asyncio.to_thread(_read_file, filename)
+            yield "turn", index, speaker_name, audio_bytes
+        
+        if parser is not None:
+            podcast_script = parser.script
+        if not audio_files:
+            yield "error", "No audio files generated", podcast_script
+            return
+        await asyncio.to_thread(RENDERS.save, render_id, "edge", speaker_count, turns, gap_ms)
+        with METRICS.span("assembly", "edge", speaker_count):
+            gaps = turn_gaps([(text, speaker_idx) for text, speaker_idx, _ in turns], gap_ms)
+            episode_file = await asyncio.to_thread(combine_turn_files, audio_files, gaps, output_format)
+        with METRICS.span("export", "edge", speaker_count):
+            episode_path = await asyncio.to_thread(finalize_episode, episode_file, speaker_count, render_id)
+        yield "done", episode_path, podcast_script
+    
+    except SegmentSynthesisError as failure:
+        await asyncio.to_thread(_remove_files, audio_files)
+        yield "error", f"Error generating voice for {failure.speaker_name}: {failure.error}", (
+            parser.script if parser else podcast_script
+        )
+    except Exception as e:
+        await asyncio.to_thread(_remove_files, audio_files)
+        yield "error", f"Multi-speaker generation error: {str(e)}", (
+            parser.script if parser else podcast_script
+        )
+
+def finalize_episode(audio_file, speaker_count, render_id=None):
+    """Move a finished episode into the artifact store without copying its bytes"""
+    extension = os.path.splitext(audio_file)[1] or ".wav"
+    render_id = render_id or uuid4().hex[:8]
+    return ARTIFACTS.add_episode(audio_file, f"podcast_{speaker_count}speakers_{render_id}{extension}")
+
+def render_id_for(episode_path):
+    """The RENDERS id of an episode named by finalize_episode (or a copy of it)"""
+    stem = os.path.splitext(os.path.basename(episode_path or ""))[0]
+    return stem.rsplit("_", 1)[-1] if stem.startswith("podcast_") else None
+
+def _script_engine(gemini):
+    """Metric label for whatever writes the script"""
+    return "gemini" if gemini is not None else "template"
+
+def _no_progress(fraction, desc=None):
+    """Progress callback for callers without a UI"""
+
+def create_podcast(text, use_gemini, tts_engine, speaker_count, progress=None, pipelined=False,
+                   long_form=False, refresh_script=False, output_format=OUTPUT_FORMAT, api_key=None):
+    """Main function to create podcast from text with multiple speakers
+
+    With ``pipelined`` (Edge TTS multi-speaker only) the script is streamed
+    from Gemini and each speaker turn is synthesized as soon as it is complete,
+    overlapping script generation with speech synthesis. ``long_form`` turns
+    the whole document into an episode (see iter_long_form_script), and
+    ``refresh_script`` bypasses the script cache. Multi-part episodes are
+    written as ``output_format`` ("mp3", "ogg" or "wav"). Scripts are written
+    with ``api_key``'s client from GEMINI_CLIENTS.
+    
+    Returns ``(episode_path, status_message, script)``; the episode file is
+    handed over as-is (never read into memory). It lives in ARTIFACTS until
+    it expires, so callers that keep episodes should move them out.
+    ``progress`` is a ``gr.Progress``-style callback; it may be omitted.
+    """
+    if progress is None:
+        progress = _no_progress
     try:
         progress(0.1, "Starting processing...")
         
         if not text.strip():
             return None, "❌ Please enter some text first!", ""
         
-        progress(0.3, "Generating podcast script...")
-        podcast_script = generate_podcast_script(text, speaker_count, use_gemini)
-        
-        progress(0.5, "Parsing script for speakers...")
-        script_parts = parse_script_for_speakers(podcast_script, speaker_count)
-        
-        progress(0.7, "Generating audio...")
-        
-        # Generate audio based on engine choice
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            temp_filename = tmp_file.name
+        use_edge_tts = tts_engine == "Multi-Speaker (Edge TTS)" and speaker_count > 1 and EDGE_TTS_AVAILABLE
+        engine = TTS_ENGINE_LABELS.get(tts_engine, tts_engine)
+        # Names the episode and keeps its turns for rerender_podcast
+        render_id = uuid4().hex[:8]
+        gemini = gemini_client(use_gemini, api_key)
         
-        if tts_engine == "Multi-Speaker (Edge TTS)" and speaker_count > 1 and EDGE_TTS_AVAILABLE:
-            # Use Edge TTS for multi-speaker
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                audio_file, error = loop.run_until_complete(
-                    generate_multi_speaker_audio(script_parts, speaker_count)
+        if pipelined and use_edge_tts:
+            progress(0.3, "Streaming script into speech synthesis...")
+            parser = ScriptTurnParser(speaker_count)
+            script_turns = stream_script_turns(
+                stream_podcast_script(text, speaker_count, gemini, long_form, refresh_script), parser,
+                _script_engine(gemini)
+            )
+            audio_file, error = ASYNC_WORKER.run(generate_multi_speaker_audio(
+                script_turns, speaker_count, output_format=output_format, render_id=render_id
+            ))
+            podcast_script = parser.script
+        else:
+            progress(0.3, "Generating podcast script...")
+            with METRICS.span("script", _script_engine(gemini), speaker_count, len(text)):
+                podcast_script = generate_podcast_script(text, speaker_count, gemini, long_form, refresh_script)
+            
+            progress(0.5, "Parsing script for speakers...")
+            with METRICS.span("parse", engine, speaker_count, len(podcast_script)):
+                script_parts = plan_turns(
+                    parse_script_for_speakers(podcast_script, speaker_count), TURN_TARGET_CHARS, TURN_MAX_CHARS
+                )
+            
+            progress(0.7, "Generating audio...")
+            
+            # Generate audio based on engine choice
+            if use_edge_tts:
+                # Use Edge TTS for multi-speaker
+                audio_file, error = ASYNC_WORKER.run(generate_multi_speaker_audio(
+                    script_parts, speaker_count, output_format=output_format, render_id=render_id
+                ))
+            elif tts_engine == "Multi-Speaker (gTTS accents)":
+                audio_file, error = generate_multi_speaker_gtts(
+                    script_parts, speaker_count, output_format=output_format, render_id=render_id
+                )
+            elif tts_engine == "gTTS (Online)":
+                audio_file, error = generate_multi_speaker_gtts(
+                    script_parts, speaker_count, accents=False, output_format=output_format, render_id=render_id
+                )
+            else:  # pyttsx3
+                audio_file, error = generate_multi_speaker_pyttsx3(
+                    script_parts, speaker_count, output_format=output_format, render_id=render_id
                 )
-            finally:
-                loop.close()
-        elif tts_engine == "gTTS (Online)":
-            full_text = " ".join([part[0] for part in script_parts])
-            audio_file, error = generate_with_gtts(full_text, temp_filename)
-        else:  # pyttsx3
-            full_text = " ".join([part[0] for part in script_parts])
-            audio_file, error = generate_with_pyttsx3(full_text, temp_filename)
+        
+        # Counters only; the disk usage needs a directory scan
+        cache_stats = SEGMENT_CACHE.stats(disk=False)
+        logger.info(f"Segment cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
         
         if error:
             return None, f"❌ {error}", podcast_script
         
         progress(0.9, "Finalizing...")
-        
-        # Read the generated audio file
-        with open(audio_file, 'rb') as f:
-            audio_data = f.read()
-        
-        # Clean up
-        try:
-            os.unlink(audio_file)
-        except:
-            pass
+        with METRICS.span("export", engine, speaker_count):
+            episode_path = finalize_episode(audio_file, speaker_count, render_id)
         
         progress(1.0, "Complete!")
-        return audio_data, "✅ Podcast generated successfully!", podcast_script
+        return episode_path, "✅ Podcast generated successfully!", podcast_script
         
     except Exception as e:
         return None, f"❌ Audio generation failed: {str(e)}", ""
 
+async def _synthesize_changed_turns(changed, speaker_count, order, max_concurrency=EDGE_TTS_MAX_CONCURRENCY):
+    """Voice ``(index, text, speaker_idx)`` turns concurrently; returns {index: filename}"""
+    semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+    
+    async def synthesize(i, speaker_text, speaker_idx):
+        speaker_name = _speaker_voice(speaker_idx, speaker_count)["name"]
+        async with semaphore:
+            with METRICS.span("synthesis", order[0], speaker_count, len(speaker_text)) as span:
+                result, error, engine = await TURN_SPEECH.synthesize(
+                    speaker_text, speaker_idx, speaker_count,
+                    ARTIFACTS.scratch_path(f"temp_edit_{i}_{uuid4().hex[:8]}"), order=order
+                )
+                span.engine = engine or span.engine
+                if not result:
+                    raise SegmentSynthesisError(speaker_name, error)
+        return i, result
+    
+    tasks = [asyncio.ensure_future(synthesize(*turn)) for turn in changed]
+    try:
+        return dict(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        _remove_files(task.result()[1] for task in tasks if not task.cancelled() and task.exception() is None)
+        raise
+
+def rerender_podcast(script, render_id, progress=None, output_format=OUTPUT_FORMAT):
+    """Re-voice an edited script, synthesizing only the turns that changed
+
+    ``script`` is parsed like a generated one and diffed against the turns
+    of render ``render_id`` (see TurnStore.reusable). Unchanged turns reuse
+    the saved audio of that render; added or edited turns are voiced with
+    its engine, falling back like any other turn. Returns
+    ``(episode_path, status_message, script)`` like create_podcast.
+    """
+    if progress is None:
+        progress = _no_progress
+    record = RENDERS.get(render_id) if render_id else None
+    if record is None:
+        return None, "❌ The previous render is no longer available, please generate the podcast again", script
+    if not script.strip():
+        return None, "❌ The script is empty!", script
+    
+    audio_files = []
+    voiced = {}
+    try:
+        progress(0.2, "Comparing with the previous render...")
+        with METRICS.span("parse", record.engine, record.speaker_count, len(script)):
+            script_parts = plan_turns(
+                parse_script_for_speakers(script, record.speaker_count), TURN_TARGET_CHARS, TURN_MAX_CHARS
+            )
+        reuse = RENDERS.reusable(record, script_parts)
+        changed = [(i, speaker_text, speaker_idx)
+                   for i, ((speaker_text, speaker_idx), files) in enumerate(zip(script_parts, reuse))
+                   if files is None]
+        logger.info(f"✏️ Re-rendering {len(changed)} of {len(script_parts)} turns")
+        
+        progress(0.4, f"Voicing {len(changed)} changed turns...")
+        order = [record.engine] + [name for name in TTS_FALLBACK_ORDER if name != record.engine]
+        voiced = ASYNC_WORKER.run(_synthesize_changed_turns(changed, record.speaker_count, order)) if changed else {}
+        
+        progress(0.8, "Assembling episode...")
+        turns = []
+        gaps = []
+        for i, ((speaker_text, speaker_idx), files) in enumerate(zip(script_parts, reuse)):
+            files = RENDERS.checkout(files) if files else [voiced.pop(i)]
+            for j, filename in enumerate(files):
+                if audio_files:
+                    new_speaker = j == 0 and speaker_idx != script_parts[i - 1][1]
+                    gaps.append(record.turn_gap_ms if new_speaker else 0)
+                audio_files.append(filename)
+            turns.append((speaker_text, speaker_idx, files))
+        
+        new_render_id = uuid4().hex[:8]
+        RENDERS.save(new_render_id, record.engine, record.speaker_count, turns, record.turn_gap_ms)
+        with METRICS.span("assembly", record.engine, record.speaker_count):
+            episode_file = combine_turn_files(audio_files, gaps, output_format)
+        audio_files = []
+        with METRICS.span("export", record.engine, record.speaker_count):
+            episode_path = finalize_episode(episode_file, record.speaker_count, new_render_id)
+        
+        progress(1.0, "Complete!")
+        return episode_path, f"✅ Re-rendered {len(changed)} of {len(script_parts)} turns", script
+    
+    except SegmentSynthesisError as failure:
+        return None, f"❌ Error generating voice for {failure.speaker_name}: {failure.error}", script
+    except Exception as e:
+        _remove_files(audio_files + list(voiced.values()))
+        return None, f"❌ Re-render failed: {str(e)}", script
+
+# Background jobs: identical requests in flight share one execution
+JOB_WORKERS = int(os.environ.get("PODCAST_JOB_WORKERS", "4"))
+
+def _run_podcast_job(progress, **params):
+    return create_podcast(progress=progress, **params)
+
+JOBS = JobManager(_run_podcast_job, max_workers=JOB_WORKERS)
+atexit.register(JOBS.shutdown)
+
+def submit_podcast_job(text, use_gemini, tts_engine, speaker_count, pipelined=False, long_form=False,
+                       refresh_script=False, output_format=OUTPUT_FORMAT, api_key=None):
+    """Queue create_podcast on the job pool and return the job id at once
+
+    Poll ``JOBS.status(job_id)`` for progress; ``JOBS.wait(job_id)`` returns
+    create_podcast's ``(episode_path, status_message, script)``. Identical
+    requests submitted while a job is in flight get that job's id.
+    """
+    use_gemini = bool(use_gemini and gemini_client(use_gemini, api_key))
+    return JOBS.submit(
+        text=text, use_gemini=use_gemini, tts_engine=tts_engine, speaker_count=int(speaker_count),
+        pipelined=pipelined, long_form=long_form, refresh_script=refresh_script, output_format=output_format,
+        # Jobs of different keys are not coalesced, so each runs on its own key's quota
+        api_key=api_key.strip() if use_gemini else None
+    )
+
 def get_speaker_info(speaker_count):
     """Get speaker information for display"""
     if speaker_count == 1:
@@ -374,6 +1560,9 @@ def get_speaker_info(speaker_count):
 
 # Create the Gradio interface
 def create_interface():
+    # Imported here so headless callers (batch.py) never load Gradio
+    import gradio as gr
+    
     custom_css = """
     .app-hero {
         background: linear-gradient(135deg, #1b3a57 0%, #3f51b5 55%, #6a1b9a 100%);
@@ -412,7 +1601,9 @@ def create_interface():
     with gr.Blocks(
         title="🎙️ Multi-Speaker Podcast Generator",
         theme=gr.themes.Soft(),
-        css=custom_css
+        css=custom_css,
+        # Gradio keeps its own copy of every served file; expire those with the episodes
+        delete_cache=(3600, int(ARTIFACTS.ttl_seconds))
     ) as demo:
         gr.HTML(
             """
@@ -462,10 +1653,35 @@ def create_interface():
                         info="Creates natural conversations (requires API key)"
                     )
 
+                    refresh_script = gr.Checkbox(
+                        label="Regenerate script",
+                        value=False,
+                        info="Ask Gemini for a new script instead of reusing the cached one for this text"
+                    )
+
+                    long_form = gr.Checkbox(
+                        label="Long document mode",
+                        value=False,
+                        info="Covers the whole text in segments generated in parallel instead of the first 2500 characters"
+                    )
+
+                    pipelined = gr.Checkbox(
+                        label="Stream script into speech synthesis",
+                        value=False,
+                        info="Starts voicing each turn while the script is still being written (Edge TTS)"
+                    )
+
+                    stream_audio = gr.Checkbox(
+                        label="Play turns as they are generated",
+                        value=False,
+                        info="Streams each speaker turn to a live player before the full episode is ready (Edge TTS)"
+                    )
+
                     tts_engine = gr.Radio(
                         label="Voice Engine",
                         choices=[
                             "Multi-Speaker (Edge TTS)",
+                            "Multi-Speaker (gTTS accents)",
                             "gTTS (Online)",
                             "pyttsx3 (Offline)"
                         ],
@@ -473,6 +1689,14 @@ def create_interface():
                         info="Edge TTS provides the most realistic conversations"
                     )
 
+                    output_format = gr.Radio(
+                        label="Output Format",
+                        choices=[("MP3", "mp3"), ("OGG (Opus)", "ogg"), ("WAV", "wav")],
+                        value=OUTPUT_FORMAT,
+                        info=("Episodes are loudness-normalized and mixed before encoding" if POST_PROCESS.active
+                              else "MP3 from Edge TTS is assembled without re-encoding")
+                    )
+
                     generate_btn = gr.Button(
                         "🎙️ Generate Podcast",
                         variant="primary",
@@ -498,9 +1722,16 @@ def create_interface():
         
         with gr.Group(elem_classes="panel"):
             gr.Markdown("## ✅ Results", elem_classes="section-title")
+            live_audio = gr.Audio(
+                label="Live Preview",
+                streaming=True,
+                autoplay=True,
+                visible=False
+            )
             with gr.Row():
                 audio_output = gr.Audio(
                     label="Generated Podcast",
+                    type="filepath",
                     visible=False
                 )
                 download_btn = gr.DownloadButton(
@@ -511,8 +1742,19 @@ def create_interface():
             script_output = gr.Textbox(
                 label="Generated Script",
                 lines=8,
+                interactive=True,
+                info="Edit any line and re-render: only the turns you changed are voiced again",
+                visible=False
+            )
+            rerender_btn = gr.Button(
+                "🔁 Re-render Edited Script",
+                variant="secondary",
                 visible=False
             )
+        
+        # Background job of the current session, polled while it runs
+        job_id = gr.State(None)
+        job_timer = gr.Timer(1.0, active=False)
         
         # Event handlers
         def update_status(message, success=True):
@@ -524,19 +1766,10 @@ def create_interface():
                 "</div>"
             )
         
-        def generate_podcast_wrapper(text, use_gemini, tts_engine, speaker_count, progress=gr.Progress()):
-            audio_data, message, script = create_podcast(text, use_gemini, tts_engine, speaker_count, progress)
+        def episode_outputs(filepath, message, script):
+            status_html = update_status(message, success=filepath is not None)
             
-            status_html = update_status(message, success=audio_data is not None)
-            
-            if audio_data:
-                # Save audio to temporary file
-                filename = f"podcast_{speaker_count}speakers_{uuid4().hex[:8]}.wav"
-                filepath = os.path.join(tempfile.gettempdir(), filename)
-                
-                with open(filepath, 'wb') as f:
-                    f.write(audio_data)
-                
+            if filepath:
                 return [
                     status_html,
                     gr.Audio(value=filepath, visible=True),
@@ -551,8 +1784,105 @@ def create_interface():
                     gr.Textbox(visible=False)
                 ]
         
+        def poll_podcast_job(current_job):
+            job = JOBS.get(current_job) if current_job else None
+            if job is None:
+                return [update_status("❌ Job not found or expired", success=False),
+                        gr.update(), gr.update(), gr.update(), gr.Timer(active=False)]
+            if not job.is_finished:
+                shared = f" · shared by {job.waiters} requests" if job.waiters > 1 else ""
+                return [update_status(f"⏳ {job.message} ({job.progress:.0%}){shared}"),
+                        gr.update(), gr.update(), gr.update(), gr.update()]
+            if job.status == FAILED:
+                outputs = episode_outputs(None, f"❌ Audio generation failed: {job.error}", "")
+            else:
+                outputs = episode_outputs(*job.result)
+            return outputs + [gr.Timer(active=False)]
+        
+        def rerender_edited_script(script, episode, output_format, progress=gr.Progress()):
+            filepath, message, script = rerender_podcast(script, render_id_for(episode), progress, output_format)
+            if filepath is None:
+                # Keep the edited script on screen so it can be fixed and retried
+                return [update_status(message, success=False), gr.update(), gr.update(), gr.update()]
+            return episode_outputs(filepath, message, script)
+        
+        async def generate_podcast_stream(text, use_gemini, tts_engine, speaker_count, pipelined, long_form,
+                                          refresh_script, output_format, stream_audio, key):
+            use_edge_tts = tts_engine == "Multi-Speaker (Edge TTS)" and speaker_count > 1 and EDGE_TTS_AVAILABLE
+            if not (stream_audio and use_edge_tts and text.strip()):
+                if not text.strip():
+                    yield [gr.Audio(visible=False)] + episode_outputs(None, "❌ Please enter some text first!", "") + [
+                        None, gr.Timer(active=False)
+                    ]
+                    return
+                # Runs on the job pool; the timer polls it so no handler waits on the episode
+                new_job = submit_podcast_job(
+                    text, use_gemini, tts_engine, speaker_count, pipelined, long_form, refresh_script, output_format,
+                    key
+                )
+                yield [
+                    gr.Audio(visible=False),
+                    update_status("⏳ Queued..."),
+                    gr.Audio(visible=False),
+                    gr.DownloadButton(visible=False),
+                    gr.Textbox(visible=False),
+                    new_job,
+                    gr.Timer(active=True)
+                ]
+                return
+            
+            yield [
+                gr.Audio(visible=True),
+                update_status("🎙️ Generating... turns will play as they are ready"),
+                gr.Audio(visible=False),
+                gr.DownloadButton(visible=False),
+                gr.Textbox(visible=False),
+                None,
+                gr.Timer(active=False)
+            ]
+            events = ASYNC_WORKER.iterate(stream_podcast(
+                text, use_gemini, speaker_count, pipelined, long_form=long_form, refresh_script=refresh_script,
+                output_format=output_format, api_key=key
+            ))
+            async for event in events:
+                if event[0] == "turn":
+                    _, index, speaker_name, audio_bytes = event
+                    yield [
+                        audio_bytes,
+                        update_status(f"🔊 Turn {index + 1} ready ({speaker_name})"),
+                        gr.update(),
+                        gr.update(),
+                        gr.update(),
+                        gr.update(),
+                        gr.update()
+                    ]
+                elif event[0] == "done":
+                    _, filepath, script = event
+                    yield [
+                        gr.update(),
+                        update_status("✅ Podcast generated successfully!"),
+                        gr.Audio(value=filepath, visible=True),
+                        gr.DownloadButton(value=filepath, visible=True),
+                        gr.Textbox(value=script, visible=True),
+                        gr.update(),
+                        gr.update()
+                    ]
+                else:
+                    _, message, script = event
+                    yield [
+                        gr.update(),
+                        update_status(f"❌ {message}", success=False),
+                        gr.Audio(visible=False),
+                        gr.DownloadButton(visible=False),
+                        gr.Textbox(value=script, visible=bool(script)),
+                        gr.update(),
+                        gr.update()
+                    ]
+        
         # Connect events
-        api_key.change(init_gemini, inputs=api_key, outputs=api_status)
+        # Not on every keystroke: each new key builds a client and takes a pool slot
+        api_key.submit(init_gemini, inputs=api_key, outputs=api_status)
+        api_key.blur(init_gemini, inputs=api_key, outputs=api_status)
         
         speaker_count.change(
             get_speaker_info,
@@ -561,14 +1891,46 @@ def create_interface():
         )
         
         generate_btn.click(
-            generate_podcast_wrapper,
-            inputs=[input_text, use_gemini, tts_engine, speaker_count],
+            generate_podcast_stream,
+            inputs=[
+                input_text, use_gemini, tts_engine, speaker_count, pipelined, long_form,
+                refresh_script, output_format, stream_audio, api_key
+            ],
+            outputs=[live_audio, status_msg, audio_output, download_btn, script_output, job_id, job_timer]
+        )
+        
+        rerender_btn.click(
+            rerender_edited_script,
+            inputs=[script_output, audio_output, output_format],
             outputs=[status_msg, audio_output, download_btn, script_output]
         )
+        
+        script_output.change(
+            lambda script: gr.Button(visible=bool(script)),
+            inputs=script_output,
+            outputs=rerender_btn,
+            show_progress="hidden"
+        )
+        
+        job_timer.tick(
+            poll_podcast_job,
+            inputs=job_id,
+            outputs=[status_msg, audio_output, download_btn, script_output, job_timer],
+            concurrency_limit=None,
+            show_progress="hidden"
+        )
     
     return demo
 
 if __name__ == "__main__":
+    logging.basicConfig(level=LOG_LEVEL, format="%(message)s")
+    if METRICS_PORT:
+        try:
+            METRICS.serve(METRICS_PORT)
+            logger.info(f"📈 Metrics at http://127.0.0.1:{METRICS_PORT}/metrics")
+        except OSError as e:
+            # A busy port costs the metrics endpoint, not the app
+            logger.warning(f"⚠️ Metrics endpoint disabled, port {METRICS_PORT} unavailable: {e}")
     demo = create_interface()
     demo.launch(
         server_name="0.0.0.0",
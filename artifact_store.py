@@ -0,0 +1,213 @@
+"""Managed directory for finished episodes and in-progress audio files.
+
+Everything the pipeline writes lives under one configurable directory:
+
+    <directory>/episodes/        finished episodes, expired after a TTL and
+                                 evicted least-recently-used over a disk quota
+    <directory>/work/<owner>/    turn files and partial episodes of one process
+
+Each process writes intermediates into its own work directory and holds an
+exclusive lock on a lock file inside it for as long as it runs. The lock
+goes away with the process however it exits, so the next startup can take
+the lock of a crashed process's directory, which proves it orphaned, and
+remove it.
+"""
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+from uuid import uuid4
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+LOCK_NAME = ".lock"
+
+# Work directories without a lock to test (half-created ones, or any on
+# platforms without flock) are only treated as orphaned once they are this old
+STALE_WORK_SECONDS = 24 * 3600
+
+
+class ArtifactStore:
+    """Size- and age-bounded store of episodes plus per-process scratch space"""
+
+    def __init__(self, directory, max_bytes=2 * 1024 * 1024 * 1024, ttl_seconds=24 * 3600):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.episodes_dir = os.path.join(directory, "episodes")
+        self.work_root = os.path.join(directory, "work")
+        self._host = socket.gethostname().replace("-", "_")
+        self._workdir = None
+        self._pid = None
+        self._lock_fd = None
+        self._lock = threading.Lock()
+        self._stats = {"episodes_added": 0, "expired": 0, "evicted": 0, "orphans_removed": 0}
+        os.makedirs(self.episodes_dir, exist_ok=True)
+        os.makedirs(self.work_root, exist_ok=True)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    @property
+    def workdir(self):
+        """This process's scratch directory (a fresh one after fork)"""
+        with self._lock:
+            if self._pid != os.getpid():
+                if self._lock_fd is not None:
+                    # Inherited across fork; the parent's copy keeps its lock
+                    os.close(self._lock_fd)
+                self._pid = os.getpid()
+                name = f"{self._host}-{self._pid}-{uuid4().hex[:8]}"
+                # Locked under a hidden name first, so cleanup never sees it unlocked
+                pending = os.path.join(self.work_root, "." + name)
+                os.makedirs(pending)
+                self._lock_fd = self._hold_lock(pending)
+                self._workdir = os.path.join(self.work_root, name)
+                os.rename(pending, self._workdir)
+            return self._workdir
+
+    @staticmethod
+    def _hold_lock(directory):
+        """Open and exclusively lock the owner lock file of ``directory``"""
+        if fcntl is None:
+            return None
+        fd = os.open(os.path.join(directory, LOCK_NAME), os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return fd
+
+    def scratch_path(self, filename):
+        """Path for an intermediate file; removed with the work directory at exit"""
+        return os.path.join(self.workdir, filename)
+
+    def add_episode(self, source, filename):
+        """Move a finished file into the episode store and enforce the limits"""
+        path = os.path.join(self.episodes_dir, filename)
+        # A rename when both paths are on the same filesystem
+        shutil.move(source, path)
+        self._count("episodes_added")
+        self.evict(keep=path)
+        return path
+
+    def _episodes(self):
+        """Return (mtime, size, path) for every stored episode"""
+        entries = []
+        try:
+            names = os.listdir(self.episodes_dir)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            path = os.path.join(self.episodes_dir, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self, keep=None):
+        """Delete expired episodes, then the oldest ones until the quota fits
+
+        ``keep`` (the episode just added) is never evicted.
+        """
+        now = time.time()
+        entries = []
+        expired = 0
+        for mtime, size, path in self._episodes():
+            if path != keep and now - mtime > self.ttl_seconds:
+                if self._remove(path):
+                    expired += 1
+                continue
+            entries.append((mtime, size, path))
+        self._count("expired", expired)
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            if self._remove(path):
+                evicted += 1
+            total -= size
+        self._count("evicted", evicted)
+        return expired + evicted
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            # Another process removed it first
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove {path}: {e}")
+            return False
+        return True
+
+    def _is_orphan(self, name, now):
+        path = os.path.join(self.work_root, name)
+        if fcntl is not None and not name.startswith("."):
+            try:
+                fd = os.open(os.path.join(path, LOCK_NAME), os.O_RDWR)
+            except FileNotFoundError:
+                fd = None
+            if fd is not None:
+                try:
+                    # The owner holds this lock until it exits, crashed or not
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return False
+                finally:
+                    os.close(fd)
+                return True
+        try:
+            return now - os.stat(path).st_mtime > STALE_WORK_SECONDS
+        except FileNotFoundError:
+            return False
+
+    def cleanup_orphans(self):
+        """Remove work directories left by processes that died, then apply the limits"""
+        now = time.time()
+        removed = 0
+        try:
+            names = os.listdir(self.work_root)
+        except FileNotFoundError:
+            names = []
+        for name in names:
+            if os.path.join(self.work_root, name) == self._workdir or not self._is_orphan(name, now):
+                continue
+            shutil.rmtree(os.path.join(self.work_root, name), ignore_errors=True)
+            removed += 1
+        self._count("orphans_removed", removed)
+        if removed:
+            logger.info(f"🧹 Removed {removed} orphaned work directories")
+        self.evict()
+        return removed
+
+    def close(self):
+        """Remove this process's work directory"""
+        with self._lock:
+            workdir = self._workdir if self._pid == os.getpid() else None
+            lock_fd = self._lock_fd
+            self._workdir = self._pid = self._lock_fd = None
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+        if lock_fd is not None:
+            os.close(lock_fd)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        entries = self._episodes()
+        stats["episodes"] = len(entries)
+        stats["bytes"] = sum(size for _, size, _ in entries)
+        return stats
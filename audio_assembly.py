@@ -0,0 +1,160 @@
+"""Linear-time assembly of speech segments into one episode.
+
+Each segment is decoded exactly once, converted to a common sample rate and
+channel layout, and written straight into the output (a streaming
+``soundfile`` writer, or one preallocated NumPy buffer). Nothing is ever
+re-copied as the episode grows, unlike repeated ``AudioSegment`` addition.
+"""
+from math import gcd
+
+import numpy as np
+import soundfile as sf
+
+from mp3_splice import splice_mp3
+
+DEFAULT_GAP_MS = 500
+
+# Output format name -> (libsndfile format, subtype, file extension)
+OUTPUT_FORMATS = {
+    "mp3": ("MP3", "MPEG_LAYER_III", ".mp3"),
+    "ogg": ("OGG", "OPUS", ".ogg"),
+    "wav": ("WAV", "PCM_16", ".wav"),
+}
+# Opus only supports these rates; anything else is resampled to 48 kHz
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+def _decode_with_pydub(path):
+    """Fallback decoder (via ffmpeg) for formats libsndfile cannot read"""
+    from pydub import AudioSegment
+
+    segment = AudioSegment.from_file(path)
+    samples = np.array(segment.get_array_of_samples(), dtype=np.float32)
+    samples /= float(1 << (8 * segment.sample_width - 1))
+    return samples.reshape(-1, segment.channels), segment.frame_rate
+
+
+def read_segment(source):
+    """Return ``(frames x channels float32 array, sample_rate)`` for a segment
+
+    ``source`` is a file path or an already decoded ``(array, sample_rate)``.
+    """
+    if isinstance(source, tuple):
+        data, rate = source
+        data = np.asarray(data, dtype=np.float32)
+    else:
+        try:
+            data, rate = sf.read(source, dtype="float32", always_2d=True)
+        except (RuntimeError, TypeError):
+            data, rate = _decode_with_pydub(source)
+    if data.ndim == 1:
+        data = data[:, None]
+    return data, rate
+
+
+def conform(data, rate, sample_rate, channels):
+    """Resample and remix ``data`` to the target layout"""
+    if rate != sample_rate:
+        # scipy.signal takes over a second to import; most episodes never resample
+        from scipy.signal import resample_poly
+        factor = gcd(int(rate), int(sample_rate))
+        data = resample_poly(data, sample_rate // factor, rate // factor, axis=0)
+    if data.shape[1] != channels:
+        if channels == 1:
+            data = data.mean(axis=1, keepdims=True)
+        else:
+            data = np.repeat(data.mean(axis=1, keepdims=True), channels, axis=1)
+    return data.astype(np.float32, copy=False)
+
+
+def _gap_frames(gap_ms, count, sample_rate):
+    """Frame counts for the ``count - 1`` gaps between segments"""
+    if count < 2:
+        return []
+    if np.isscalar(gap_ms):
+        gaps = [gap_ms] * (count - 1)
+    else:
+        gaps = list(gap_ms)
+        if len(gaps) != count - 1:
+            raise ValueError(f"Expected {count - 1} gaps, got {len(gaps)}")
+    return [int(round(sample_rate * g / 1000.0)) for g in gaps]
+
+
+def _probe_layout(sources, sample_rate, channels):
+    """Pick the output layout from the first segment when not given"""
+    if sample_rate and channels:
+        return sample_rate, channels, None
+    first = read_segment(sources[0])
+    data, rate = first
+    return sample_rate or rate, channels or data.shape[1], first
+
+
+def assemble_segments(sources, output_path, gap_ms=DEFAULT_GAP_MS,
+                      sample_rate=None, channels=None, subtype="PCM_16", format=None):
+    """Stream segments into ``output_path`` with silence between them
+
+    Peak memory is one decoded segment, regardless of episode length.
+    Returns the number of frames written.
+    """
+    if not sources:
+        raise ValueError("No segments to assemble")
+    sample_rate, channels, first = _probe_layout(sources, sample_rate, channels)
+    if subtype == "OPUS" and sample_rate not in OPUS_SAMPLE_RATES:
+        sample_rate = 48000
+    gaps = _gap_frames(gap_ms, len(sources), sample_rate)
+    silence = np.zeros((max(gaps, default=0), channels), dtype=np.float32)
+    written = 0
+
+    with sf.SoundFile(output_path, "w", samplerate=sample_rate,
+                      channels=channels, subtype=subtype, format=format) as out:
+        for i, source in enumerate(sources):
+            data, rate = first if (i == 0 and first) else read_segment(source)
+            data = conform(data, rate, sample_rate, channels)
+            out.write(data)
+            written += len(data)
+            if i < len(gaps):
+                out.write(silence[:gaps[i]])
+                written += gaps[i]
+    return written
+
+
+def assemble_to_array(sources, gap_ms=DEFAULT_GAP_MS, sample_rate=None, channels=None):
+    """Decode segments once and copy them into one preallocated buffer
+
+    Returns ``(frames x channels float32 array, sample_rate)``.
+    """
+    if not sources:
+        raise ValueError("No segments to assemble")
+    sample_rate, channels, first = _probe_layout(sources, sample_rate, channels)
+    decoded = []
+    for i, source in enumerate(sources):
+        data, rate = first if (i == 0 and first) else read_segment(source)
+        decoded.append(conform(data, rate, sample_rate, channels))
+    gaps = _gap_frames(gap_ms, len(decoded), sample_rate)
+
+    total = sum(len(d) for d in decoded) + sum(gaps)
+    episode = np.zeros((total, channels), dtype=np.float32)
+    offset = 0
+    for i, data in enumerate(decoded):
+        episode[offset:offset + len(data)] = data
+        offset += len(data)
+        if i < len(gaps):
+            offset += gaps[i]
+    return episode, sample_rate
+
+
+def assemble_episode(sources, output_path, output_format="wav", gap_ms=DEFAULT_GAP_MS):
+    """Assemble segment files into ``output_path`` in ``output_format``
+
+    MP3 output from MP3 segments that share one stream layout is spliced
+    frame by frame (no decoding or re-encoding); everything else is decoded
+    once and encoded by assemble_segments.
+    """
+    format, subtype, _ = OUTPUT_FORMATS[output_format]
+    if output_format == "mp3" and all(
+        isinstance(source, str) and source.lower().endswith(".mp3") for source in sources
+    ):
+        if splice_mp3(sources, output_path, gap_ms):
+            return output_path
+    assemble_segments(sources, output_path, gap_ms=gap_ms, subtype=subtype, format=format)
+    return output_path
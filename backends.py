@@ -0,0 +1,66 @@
+"""Registry of optional engine backends that are imported on first use.
+
+The Gemini client and each TTS engine pull in large dependency trees, and a
+process usually needs only one or two of them. Loaders are registered up
+front but run only when a backend is first requested, so startup and worker
+memory only pay for what is actually used. Availability checks look for the
+packages without importing them.
+"""
+import importlib.util
+import threading
+
+
+class BackendRegistry:
+    """Maps backend names to loaders whose results are cached once loaded"""
+
+    def __init__(self):
+        self._loaders = {}
+        self._requires = {}
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, requires=()):
+        """Decorator registering ``loader()`` for ``name``
+
+        ``requires`` lists the top-level modules the loader imports; they are
+        used by available() and never imported here.
+        """
+        def decorator(loader):
+            self._loaders[name] = loader
+            self._requires[name] = tuple(requires)
+            return loader
+        return decorator
+
+    def available(self, name):
+        """True if the backend's packages are installed (without importing them)"""
+        if name in self._loaded:
+            return True
+        for module in self._requires.get(name, ()):
+            try:
+                if importlib.util.find_spec(module) is None:
+                    return False
+            except (ImportError, ValueError):
+                return False
+        return name in self._loaders
+
+    def is_loaded(self, name):
+        return name in self._loaded
+
+    def override(self, name, backend):
+        """Use ``backend`` for ``name`` instead of loading it (stand-ins for benchmarks)"""
+        with self._lock:
+            self._loaded[name] = backend
+
+    def get(self, name):
+        """Load the backend on first use and return what its loader returned
+
+        Raises ImportError if the backend's packages are missing.
+        """
+        try:
+            return self._loaded[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name not in self._loaded:
+                self._loaded[name] = self._loaders[name]()
+            return self._loaded[name]
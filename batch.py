@@ -0,0 +1,248 @@
+"""Headless batch rendering of many documents into podcast episodes.
+
+Renders a directory of text files or a JSONL manifest with a pool of worker
+processes, each running the same pipeline as the web UI (create_podcast).
+Every finished item is appended to ``results.jsonl`` in the output directory,
+so an interrupted run picks up where it stopped. Gradio is never imported.
+
+    python batch.py articles/ episodes/ --workers 4 --engine edge
+    python batch.py manifest.jsonl episodes/ --speakers 3 --format ogg
+
+Manifest lines are JSON objects with ``id`` and either ``text`` or ``path``
+(relative to the manifest), optionally overriding ``speakers``, ``engine``,
+``use_gemini`` and ``long_form`` for that item.
+"""
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+logger = logging.getLogger(__name__)
+
+RESULTS_FILE = "results.jsonl"
+DOCUMENT_EXTENSIONS = (".txt", ".md")
+
+# Short names for the voice engines offered in the UI
+TTS_ENGINES = {
+    "edge": "Multi-Speaker (Edge TTS)",
+    "gtts-accents": "Multi-Speaker (gTTS accents)",
+    "gtts": "gTTS (Online)",
+    "pyttsx3": "pyttsx3 (Offline)",
+}
+
+
+def _item_id(name):
+    """A filesystem-safe episode name"""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", name).strip("._") or "item"
+
+
+def load_items(source):
+    """Read work items from a directory of documents or a JSONL manifest
+
+    Returns dicts with ``id`` and ``path`` or ``text`` plus any per-item
+    overrides. Duplicate ids are rejected.
+    """
+    items = []
+    if os.path.isdir(source):
+        for root, _, names in os.walk(source):
+            for name in sorted(names):
+                if name.lower().endswith(DOCUMENT_EXTENSIONS):
+                    path = os.path.join(root, name)
+                    relative = os.path.splitext(os.path.relpath(path, source))[0]
+                    items.append({"id": _item_id(relative), "path": path})
+        items.sort(key=lambda item: item["id"])
+    else:
+        base = os.path.dirname(os.path.abspath(source))
+        with open(source, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                if "text" not in item and "path" not in item:
+                    raise ValueError(f"{source}:{line_number}: item needs 'text' or 'path'")
+                if "path" in item:
+                    item["path"] = os.path.join(base, item["path"])
+                    item.setdefault("id", os.path.splitext(os.path.basename(item["path"]))[0])
+                if "id" not in item:
+                    raise ValueError(f"{source}:{line_number}: item needs an 'id'")
+                item["id"] = _item_id(str(item["id"]))
+                items.append(item)
+
+    seen = set()
+    for item in items:
+        if item["id"] in seen:
+            raise ValueError(f"Duplicate item id: {item['id']}")
+        seen.add(item["id"])
+    return items
+
+
+def load_results(output_dir):
+    """Latest recorded result per item id from a previous run"""
+    results = {}
+    path = os.path.join(output_dir, RESULTS_FILE)
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A line cut short by a crash
+                    continue
+                results[record["id"]] = record
+    except FileNotFoundError:
+        pass
+    return results
+
+
+def _is_done(record, output_dir):
+    return (record.get("status") == "ok"
+            and os.path.exists(os.path.join(output_dir, record["episode"])))
+
+
+# The Gemini key of this worker process, set by _init_worker
+_api_key = None
+
+
+def _init_worker(api_key, log_level, workers=1):
+    global _api_key
+    logging.basicConfig(level=log_level, format="%(message)s")
+    import app
+
+    if "PODCAST_PYTTSX3_WORKERS" not in os.environ:
+        # Each worker gets a share of the cores for its own pyttsx3 pool
+        app.PYTTSX3_WORKERS = max(1, (os.cpu_count() or 1) // workers)
+    if api_key:
+        # Every worker has its own pool, so each gets a share of the key's quota
+        app.GEMINI_CLIENTS.requests_per_minute /= workers
+        app.GEMINI_CLIENTS.burst = max(1, app.GEMINI_CLIENTS.burst // workers)
+        _api_key = api_key
+        logger.info(app.init_gemini(api_key))
+
+
+def render_item(item, output_dir, options):
+    """Render one item in a worker process; returns its results record"""
+    import app
+
+    start = time.perf_counter()
+    record = {"id": item["id"], "status": "error", "episode": None, "error": None}
+    try:
+        if "text" in item:
+            text = item["text"]
+        else:
+            with open(item["path"], encoding="utf-8") as f:
+                text = f.read()
+        speaker_count = int(item.get("speakers", options["speakers"]))
+        engine = TTS_ENGINES.get(item.get("engine", options["engine"]), item.get("engine", options["engine"]))
+        episode_path, message, script = app.create_podcast(
+            text,
+            item.get("use_gemini", options["use_gemini"]),
+            engine,
+            speaker_count,
+            long_form=item.get("long_form", options["long_form"]),
+            refresh_script=options["refresh_script"],
+            output_format=options["output_format"],
+            api_key=_api_key,
+        )
+        record["script_chars"] = len(script or "")
+        if episode_path is None:
+            record["error"] = message
+        else:
+            episode = item["id"] + os.path.splitext(episode_path)[1]
+            shutil.move(episode_path, os.path.join(output_dir, episode))
+            record.update(status="ok", episode=episode)
+    except Exception as e:
+        record["error"] = str(e)
+    record["seconds"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def render_batch(items, output_dir, workers=None, api_key=None, speakers=2, engine="edge",
+                 use_gemini=True, long_form=False, refresh_script=False, output_format="mp3",
+                 resume=True):
+    """Render ``items`` (see load_items) into ``output_dir`` across worker processes
+
+    Items already rendered by a previous run are skipped when ``resume`` is
+    set. Returns the results records of this run in completion order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    options = {
+        "speakers": speakers,
+        "engine": engine,
+        "use_gemini": use_gemini and bool(api_key),
+        "long_form": long_form,
+        "refresh_script": refresh_script,
+        "output_format": output_format,
+    }
+    previous = load_results(output_dir) if resume else {}
+    pending = [item for item in items
+               if not (item["id"] in previous and _is_done(previous[item["id"]], output_dir))]
+    skipped = len(items) - len(pending)
+    print(f"{len(pending)} items to render, {skipped} already done")
+    if not pending:
+        return []
+
+    results = []
+    workers = min(workers or os.cpu_count() or 1, len(pending))
+    with open(os.path.join(output_dir, RESULTS_FILE), "a", encoding="utf-8") as manifest, \
+            ProcessPoolExecutor(max_workers=workers,
+                                initializer=_init_worker,
+                                initargs=(api_key, logging.getLogger().level, workers)) as pool:
+        futures = {pool.submit(render_item, item, output_dir, options): item for item in pending}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                record = future.result()
+            except Exception as e:
+                # The worker process itself died
+                record = {"id": futures[future]["id"], "status": "error", "episode": None,
+                          "error": str(e), "seconds": None}
+            manifest.write(json.dumps(record, ensure_ascii=False) + "\n")
+            manifest.flush()
+            results.append(record)
+            mark = "✅" if record["status"] == "ok" else "❌"
+            print(f"[{done}/{len(pending)}] {mark} {record['id']} ({record['seconds']}s)"
+                  + (f": {record['error']}" if record["error"] else ""))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a directory or JSONL manifest of documents into podcasts")
+    parser.add_argument("source", help="Directory of .txt/.md files or a JSONL manifest")
+    parser.add_argument("output_dir", help="Where episodes and results.jsonl are written")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--speakers", type=int, choices=[1, 2, 3, 4], default=2)
+    parser.add_argument("--engine", choices=sorted(TTS_ENGINES), default="edge")
+    parser.add_argument("--format", dest="output_format", choices=["mp3", "ogg", "wav"], default="mp3")
+    parser.add_argument("--api-key", default=os.environ.get("GEMINI_API_KEY"),
+                        help="Gemini API key (default: $GEMINI_API_KEY); without one the fallback script is used")
+    parser.add_argument("--no-gemini", action="store_true", help="Use the template script instead of Gemini")
+    parser.add_argument("--long-form", action="store_true", help="Cover whole documents instead of a short episode")
+    parser.add_argument("--refresh-script", action="store_true", help="Ignore cached scripts")
+    parser.add_argument("--no-resume", action="store_true", help="Re-render items finished by a previous run")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=os.environ.get("PODCAST_LOG_LEVEL", "INFO").upper(), format="%(message)s")
+
+    results = render_batch(
+        load_items(args.source),
+        args.output_dir,
+        workers=args.workers,
+        api_key=args.api_key,
+        speakers=args.speakers,
+        engine=args.engine,
+        use_gemini=not args.no_gemini,
+        long_form=args.long_form,
+        refresh_script=args.refresh_script,
+        output_format=args.output_format,
+        resume=not args.no_resume,
+    )
+    failed = sum(1 for record in results if record["status"] != "ok")
+    print(f"Done: {len(results) - failed} rendered, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
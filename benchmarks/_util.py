@@ -0,0 +1,10 @@
+"""Helpers shared by the benchmark scripts."""
+import resource
+import sys
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
@@ -0,0 +1,93 @@
+"""Benchmark episode assembly: repeated AudioSegment addition vs audio_assembly.
+
+Builds synthetic ~10 s speech-like segments once, then assembles episodes of
+increasing length. The per-minute cost of ``assemble_segments`` should stay
+flat (linear scaling) while the legacy loop grows with episode length.
+
+    python benchmarks/bench_assembly.py [--minutes 1 5 15 30 60] [--legacy-max-minutes 15]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_assembly import assemble_segments  # noqa: E402
+
+SAMPLE_RATE = 24000
+SEGMENT_SECONDS = 10
+POOL_SIZE = 8
+GAP_MS = 500
+
+
+def make_segment_pool(directory):
+    """Write a handful of distinct mono WAV segments to reuse as turns"""
+    rng = np.random.default_rng(0)
+    t = np.arange(SEGMENT_SECONDS * SAMPLE_RATE) / SAMPLE_RATE
+    paths = []
+    for i in range(POOL_SIZE):
+        tone = 0.2 * np.sin(2 * np.pi * (140 + 20 * i) * t)
+        noise = 0.05 * rng.standard_normal(len(t))
+        path = os.path.join(directory, f"segment_{i}.wav")
+        sf.write(path, (tone + noise).astype(np.float32), SAMPLE_RATE)
+        paths.append(path)
+    return paths
+
+
+def legacy_assemble(paths, output_path):
+    """The original combine loop from generate_multi_speaker_audio"""
+    from pydub import AudioSegment
+
+    combined_audio = AudioSegment.empty()
+    for i, path in enumerate(paths):
+        combined_audio += AudioSegment.from_file(path)
+        if i < len(paths) - 1:
+            combined_audio += AudioSegment.silent(duration=GAP_MS)
+    combined_audio.export(output_path, format="wav")
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 5, 15, 30, 60])
+    parser.add_argument("--legacy-max-minutes", type=float, default=15,
+                        help="skip the quadratic legacy loop above this length")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        pool = make_segment_pool(workdir)
+        output = os.path.join(workdir, "episode.wav")
+
+        print(f"{'minutes':>8} {'turns':>6} {'engine':>10} {'seconds':>9} "
+              f"{'s/min':>8} {'peak MB':>9}")
+        for minutes in args.minutes:
+            turns = max(1, int(minutes * 60 / (SEGMENT_SECONDS + GAP_MS / 1000)))
+            paths = [pool[i % POOL_SIZE] for i in range(turns)]
+
+            runs = [("assembler", assemble_segments, (paths, output, GAP_MS))]
+            if minutes <= args.legacy_max_minutes:
+                runs.append(("pydub +=", legacy_assemble, (paths, output)))
+
+            for label, fn, fn_args in runs:
+                elapsed, peak = measure(fn, *fn_args)
+                print(f"{minutes:>8g} {turns:>6} {label:>10} {elapsed:>9.2f} "
+                      f"{elapsed / minutes:>8.3f} {peak / 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
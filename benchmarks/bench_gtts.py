@@ -0,0 +1,109 @@
+"""Benchmark gTTS rendering against a local stand-in for the Google endpoint.
+
+A threaded HTTP server answers gTTS's batchexecute requests with a short MP3
+after a configurable latency, so the sequential path (the whole script in one
+gTTS call) and generate_multi_speaker_gtts can be compared without network
+access or quota.
+
+    python benchmarks/bench_gtts.py [--latency-ms 150] [--turns 4 8 16]
+"""
+import argparse
+import base64
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app  # noqa: E402
+from segment_cache import SegmentCache  # noqa: E402
+
+SAMPLE_RATE = 24000
+TURN_TEXT = (
+    "This is a sentence spoken by one of the hosts about the topic at hand. "
+    "It carries on for a while so that gTTS has to split it into pieces. "
+    "And here is a final remark before handing over to the next speaker."
+)
+
+
+def make_mp3(seconds=0.5):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    buffer = io.BytesIO()
+    sf.write(buffer, (0.2 * np.sin(2 * np.pi * 220 * t)).astype(np.float32),
+             SAMPLE_RATE, format="MP3")
+    return buffer.getvalue()
+
+
+def make_handler(latency, payload):
+    encoded = base64.b64encode(payload).decode("ascii")
+    body = (")]}'\n\n" f'[["wrb.fr","jQ1olc","[\\"{encoded}\\"]",null,null,null,"generic"]]\n').encode()
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        requests = 0
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            type(self).requests += 1
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return StandInHandler
+
+
+def run(label, fn):
+    # A fresh cache per run so every piece really hits the server
+    app.SEGMENT_CACHE = SegmentCache(tempfile.mkdtemp(prefix="bench_gtts_"))
+    start = time.perf_counter()
+    audio_file, error = fn()
+    elapsed = time.perf_counter() - start
+    if error:
+        raise RuntimeError(f"{label}: {error}")
+    os.unlink(audio_file)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--turns", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--speakers", type=int, default=2)
+    args = parser.parse_args()
+
+    handler = make_handler(args.latency_ms / 1000, make_mp3())
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    app.GTTS_ENDPOINT = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"{'turns':>6} {'requests':>9} {'sequential s':>13} {'parallel s':>11} {'speedup':>8}")
+    try:
+        for turns in args.turns:
+            parts = [(TURN_TEXT, i % args.speakers) for i in range(turns)]
+            full_text = " ".join(text for text, _ in parts)
+
+            handler.requests = 0
+            sequential = run("sequential", lambda: app.generate_with_gtts(
+                full_text, os.path.join(tempfile.mkdtemp(prefix="bench_gtts_"), "episode.mp3")))
+            requests = handler.requests
+            parallel = run("parallel", lambda: app.generate_multi_speaker_gtts(parts, args.speakers))
+            print(f"{turns:>6} {requests:>9} {sequential:>13.2f} {parallel:>11.2f} "
+                  f"{sequential / parallel:>7.1f}x")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
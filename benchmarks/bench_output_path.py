@@ -0,0 +1,88 @@
+"""Benchmark handing a finished episode to the UI: byte round-trip vs file handoff.
+
+The legacy path read the whole episode into memory in create_podcast and
+wrote those bytes to a new tempfile in generate_podcast_wrapper. The current
+path moves the single artifact into place with finalize_episode. Each mode
+runs in a fresh process so peak RSS (ru_maxrss) is measured per job.
+
+    python benchmarks/bench_output_path.py [--minutes 10 30 60]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from uuid import uuid4
+
+import numpy as np
+import soundfile as sf
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from _util import peak_rss_bytes  # noqa: E402
+
+SAMPLE_RATE = 24000
+
+
+def write_episode(path, minutes):
+    """Write a mono 16-bit WAV of the given length without holding it in memory"""
+    block = (0.1 * np.sin(2 * np.pi * 200 * np.arange(SAMPLE_RATE) / SAMPLE_RATE)).astype(np.float32)
+    with sf.SoundFile(path, "w", samplerate=SAMPLE_RATE, channels=1, subtype="PCM_16") as out:
+        for _ in range(int(minutes * 60)):
+            out.write(block)
+
+
+def legacy_handoff(audio_file, speaker_count):
+    """create_podcast + generate_podcast_wrapper before the file handoff"""
+    with open(audio_file, 'rb') as f:
+        audio_data = f.read()
+    os.unlink(audio_file)
+    filepath = os.path.join(tempfile.gettempdir(), f"podcast_{speaker_count}speakers_{uuid4().hex[:8]}.wav")
+    with open(filepath, 'wb') as f:
+        f.write(audio_data)
+    return filepath
+
+
+def child(mode, path):
+    import app
+
+    handoff = legacy_handoff if mode == "legacy" else app.finalize_episode
+    baseline = peak_rss_bytes()
+    start = time.perf_counter()
+    filepath = handoff(path, 2)
+    elapsed = time.perf_counter() - start
+    peak = peak_rss_bytes()
+    os.unlink(filepath)
+    print(json.dumps({"seconds": elapsed, "extra_peak_rss": peak - baseline}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, nargs="+", default=[10, 30, 60])
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    print(f"{'minutes':>8} {'file MB':>8} {'mode':>8} {'seconds':>8} {'extra peak RSS MB':>18}")
+    for minutes in args.minutes:
+        for mode in ("legacy", "handoff"):
+            path = os.path.join(tempfile.gettempdir(), f"bench_episode_{uuid4().hex[:8]}.wav")
+            write_episode(path, minutes)
+            size = os.path.getsize(path)
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", mode, path],
+                check=True, capture_output=True, text=True, cwd=ROOT
+            ).stdout.strip().splitlines()[-1]
+            result = json.loads(output)
+            print(f"{minutes:>8g} {size / 1e6:>8.1f} {mode:>8} {result['seconds']:>8.3f} "
+                  f"{result['extra_peak_rss'] / 1e6:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
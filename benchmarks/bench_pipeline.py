@@ -0,0 +1,196 @@
+"""End-to-end benchmark of create_podcast with offline fake Gemini and TTS backends.
+
+Runs the real pipeline (script caching, parsing, concurrent synthesis,
+assembly, export) against the deterministic stand-ins in fakes.py across
+document lengths, speaker counts and numbers of concurrent jobs. Reports
+end-to-end latency, throughput and the mean time per stage from app.METRICS.
+
+    python benchmarks/bench_pipeline.py [--lengths 500 1500 2500] [--speakers 1 2 3 4]
+                                        [--concurrency 1 4 8] [--save results.json]
+    python benchmarks/bench_pipeline.py --baseline results.json --tolerance 0.2
+
+With ``--baseline`` the run fails (exit status 1) when any scenario's median
+latency regressed by more than ``--tolerance`` against a saved run.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import soundfile as sf
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app  # noqa: E402
+import fakes  # noqa: E402
+from metrics import Metrics  # noqa: E402
+from script_cache import ScriptCache  # noqa: E402
+from segment_cache import SegmentCache  # noqa: E402
+
+STAGES = ("script", "parse", "synthesis", "assembly", "export")
+ENGINES = {
+    "edge": "Multi-Speaker (Edge TTS)",
+    "pyttsx3": "pyttsx3 (Offline)",
+}
+VOCABULARY = (
+    "energy solar wind storage grid battery market policy cost research network demand supply "
+    "climate carbon panel turbine capacity investment transition efficiency future system"
+).split()
+
+
+def make_document(length, seed):
+    """Deterministic prose of about ``length`` characters"""
+    rng = np.random.default_rng(seed)
+    sentences = []
+    size = 0
+    while size < length:
+        words = rng.choice(VOCABULARY, size=int(rng.integers(8, 16)))
+        sentence = " ".join(words).capitalize() + "."
+        sentences.append(sentence)
+        size += len(sentence) + 1
+    return " ".join(sentences)[:length]
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_scenario(length, speakers, concurrency, rounds, engine, pipelined, long_form):
+    # Fresh caches and metrics so every job does the full amount of work
+    cache_root = tempfile.mkdtemp(prefix="bench_pipeline_")
+    app.SEGMENT_CACHE = SegmentCache(os.path.join(cache_root, "segments"))
+    app.SCRIPT_CACHE = ScriptCache(os.path.join(cache_root, "scripts"))
+    app.METRICS = Metrics()
+
+    def job(seed):
+        text = make_document(length, seed)
+        start = time.perf_counter()
+        episode, message, _ = app.create_podcast(
+            text, True, ENGINES[engine], speakers, pipelined=pipelined, long_form=long_form, api_key=fakes.API_KEY
+        )
+        elapsed = time.perf_counter() - start
+        if episode is None:
+            raise RuntimeError(message)
+        audio_seconds = sf.info(episode).duration
+        os.unlink(episode)
+        return elapsed, audio_seconds
+
+    latencies = []
+    audio_seconds = 0.0
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for round_index in range(rounds):
+                seeds = [round_index * concurrency + i for i in range(concurrency)]
+                for elapsed, seconds in pool.map(job, seeds):
+                    latencies.append(elapsed)
+                    audio_seconds += seconds
+    finally:
+        shutil.rmtree(cache_root, ignore_errors=True)
+    wall = time.perf_counter() - started
+
+    stages = {stage: [0, 0.0] for stage in STAGES}
+    for (stage, _, _), (count, total) in app.METRICS.stage_seconds.totals().items():
+        if stage in stages:
+            stages[stage][0] += count
+            stages[stage][1] += total
+    return {
+        "key": f"{length}c-{speakers}s-{concurrency}x",
+        "length": length,
+        "speakers": speakers,
+        "concurrency": concurrency,
+        "jobs": len(latencies),
+        "p50": statistics.median(latencies),
+        "p95": percentile(latencies, 0.95),
+        "episodes_per_minute": 60 * len(latencies) / wall,
+        "realtime_factor": audio_seconds / wall,
+        "stage_mean_ms": {stage: (1000 * total / count if count else 0.0)
+                          for stage, (count, total) in stages.items()},
+        "stage_spans": {stage: count for stage, (count, _) in stages.items()},
+    }
+
+
+def compare(results, baseline_path, tolerance):
+    with open(baseline_path) as f:
+        baseline = {result["key"]: result for result in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["key"])
+        if previous and result["p50"] > previous["p50"] * (1 + tolerance):
+            regressions.append(
+                f"{result['key']}: p50 {previous['p50']:.3f}s -> {result['p50']:.3f}s "
+                f"(+{100 * (result['p50'] / previous['p50'] - 1):.0f}%)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[500, 1500, 2500],
+                        help="Document lengths in characters")
+    parser.add_argument("--speakers", type=int, nargs="+", choices=[1, 2, 3, 4], default=[1, 2, 3, 4])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8],
+                        help="Jobs running at the same time")
+    parser.add_argument("--rounds", type=int, default=2, help="Batches of concurrent jobs per scenario")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="edge",
+                        help="Multi-speaker engine (single-speaker jobs always use pyttsx3, as in the app)")
+    parser.add_argument("--pipelined", action="store_true", help="Stream the script into synthesis")
+    parser.add_argument("--long-form", action="store_true", help="Script whole documents in parallel segments")
+    parser.add_argument("--batched", action="store_true",
+                        help="Voice several turns of a speaker per Edge TTS request (PODCAST_TTS_BATCHED)")
+    parser.add_argument("--llm-latency-ms", type=float, default=800)
+    parser.add_argument("--llm-chars-per-second", type=float, default=400)
+    parser.add_argument("--tts-latency-ms", type=float, default=300)
+    parser.add_argument("--tts-ms-per-char", type=float, default=2)
+    parser.add_argument("--save", help="Write the results as JSON")
+    parser.add_argument("--baseline", help="JSON from an earlier --save run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p50 slowdown against the baseline")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    fakes.install(
+        app,
+        llm_latency=args.llm_latency_ms / 1000,
+        llm_chars_per_second=args.llm_chars_per_second,
+        tts_latency=args.tts_latency_ms / 1000,
+        tts_seconds_per_char=args.tts_ms_per_char / 1000,
+    )
+    app.TTS_BATCHED = args.batched
+
+    header = (f"{'chars':>6} {'spk':>3} {'conc':>4} {'p50 s':>7} {'p95 s':>7} {'ep/min':>7} {'x rt':>6} "
+              + " ".join(f"{stage + ' ms':>12}" for stage in STAGES))
+    print(header)
+    results = []
+    for length in args.lengths:
+        for speakers in args.speakers:
+            for concurrency in args.concurrency:
+                result = run_scenario(length, speakers, concurrency, args.rounds, args.engine,
+                                      args.pipelined, args.long_form)
+                results.append(result)
+                print(f"{length:>6} {speakers:>3} {concurrency:>4} {result['p50']:>7.3f} {result['p95']:>7.3f} "
+                      f"{result['episodes_per_minute']:>7.1f} {result['realtime_factor']:>6.1f} "
+                      + " ".join(f"{result['stage_mean_ms'][stage]:>12.1f}" for stage in STAGES))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
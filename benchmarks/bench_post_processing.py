@@ -0,0 +1,119 @@
+"""Benchmark whole-episode post-processing: NumPy buffer vs a pydub chain.
+
+Builds synthetic speech-like segments at deliberately different levels
+(like voices that come out louder or quieter), then renders episodes of
+increasing length with per-segment loudness normalization, crossfades, a
+background bed and a resample to 48 kHz. Reports time, the real-time factor
+(audio seconds per second of processing, single thread) and peak memory.
+The pydub chain normalizes, appends with a crossfade and overlays the bed
+segment by segment, the way it is usually done with AudioSegment.
+
+    python benchmarks/bench_post_processing.py [--minutes 1 10 30 60] [--legacy-max-minutes 5]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from post_processing import PostProcess, loudness_db, render_episode  # noqa: E402
+
+SAMPLE_RATE = 24000
+SEGMENT_SECONDS = 10
+POOL_SIZE = 8
+CROSSFADE_MS = 300
+TARGET_DB = -20.0
+BED_DB = -30.0
+OUTPUT_RATE = 48000
+
+
+def make_segment_pool():
+    """Decoded mono segments whose levels span about 18 dB"""
+    rng = np.random.default_rng(0)
+    t = np.arange(SEGMENT_SECONDS * SAMPLE_RATE) / SAMPLE_RATE
+    # Syllable-rate envelope so gating sees speech-like pauses
+    envelope = np.clip(np.sin(2 * np.pi * 3 * t), 0, None)
+    pool = []
+    for i in range(POOL_SIZE):
+        level = 10 ** (-(6 + 18 * i / (POOL_SIZE - 1)) / 20)
+        tone = np.sin(2 * np.pi * (140 + 20 * i) * t) + 0.3 * rng.standard_normal(len(t))
+        pool.append(((level * envelope * tone).astype(np.float32)[:, None], SAMPLE_RATE))
+    return pool
+
+
+def make_bed():
+    t = np.arange(20 * SAMPLE_RATE) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * 110 * t)).astype(np.float32)[:, None], SAMPLE_RATE
+
+
+def legacy_render(sources, bed):
+    """Normalize, crossfade and overlay with pydub, one segment at a time"""
+    from pydub import AudioSegment
+
+    def to_segment(data):
+        return AudioSegment((data[:, 0] * 32767).astype(np.int16).tobytes(), frame_rate=SAMPLE_RATE,
+                            sample_width=2, channels=1)
+
+    episode = None
+    for data, _ in sources:
+        segment = to_segment(data)
+        segment = segment.apply_gain(TARGET_DB - segment.dBFS)
+        episode = segment if episode is None else episode.append(segment, crossfade=CROSSFADE_MS)
+    episode = episode.overlay(to_segment(bed[0]).apply_gain(BED_DB), loop=True)
+    return episode.set_frame_rate(OUTPUT_RATE)
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 10, 30, 60])
+    parser.add_argument("--legacy-max-minutes", type=float, default=5,
+                        help="skip the quadratic pydub chain above this length")
+    args = parser.parse_args()
+
+    pool = make_segment_pool()
+    bed = make_bed()
+    post = PostProcess(loudness_db=TARGET_DB, crossfade_ms=CROSSFADE_MS, bed=bed, bed_db=BED_DB,
+                       sample_rate=OUTPUT_RATE)
+    # Warm up scipy's import so it is not billed to the first run
+    render_episode(pool[:2], 500, post)
+
+    print(f"{'minutes':>8} {'turns':>6} {'engine':>8} {'seconds':>9} {'x rt':>8} {'peak MB':>9} {'level spread dB':>16}")
+    for minutes in args.minutes:
+        turns = max(2, int(minutes * 60 / SEGMENT_SECONDS))
+        sources = [pool[i % POOL_SIZE] for i in range(turns)]
+
+        runs = [("numpy", render_episode, (sources, 500, post))]
+        if minutes <= args.legacy_max_minutes:
+            runs.append(("pydub", legacy_render, (sources, bed)))
+
+        for label, fn, fn_args in runs:
+            elapsed, peak, result = measure(fn, *fn_args)
+            if label == "numpy":
+                episode, rate = result
+                # Loudness of each turn in the output, away from the crossfades
+                step = len(episode) // turns
+                levels = [loudness_db(episode[i * step + rate // 2:(i + 1) * step - rate // 2], rate)
+                          for i in range(min(turns, POOL_SIZE))]
+                spread = f"{max(levels) - min(levels):.1f}"
+            else:
+                spread = "-"
+            print(f"{minutes:>8g} {turns:>6} {label:>8} {elapsed:>9.2f} {minutes * 60 / elapsed:>8.0f} "
+                  f"{peak / 1e6:>9.1f} {spread:>16}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark cold start: import time and peak RSS of the app's entry points.
+
+Each scenario runs in a fresh interpreter, like an autoscaled worker:
+
+    headless   import app (what batch.py workers do before their first job)
+    ui         import app and build the Gradio interface (python app.py, minus launch)
+    eager      import app and load every registered backend, as app.py did
+               before backends were resolved on first use
+
+    python benchmarks/bench_startup.py [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from _util import peak_rss_bytes  # noqa: E402
+
+SCENARIOS = ("headless", "ui", "eager")
+
+
+def child(scenario):
+    import warnings
+    warnings.simplefilter("ignore")
+
+    start = time.perf_counter()
+    import app
+
+    if scenario == "ui":
+        app.create_interface()
+    elif scenario == "eager":
+        for name in ("gemini", "gtts", "edge_tts", "pyttsx3"):
+            if app.BACKENDS.available(name):
+                app.BACKENDS.get(name)
+        # scipy.signal used to be imported by audio_assembly at module load
+        import scipy.signal  # noqa: F401
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "seconds": elapsed,
+        "peak_rss": peak_rss_bytes(),
+        "gradio": "gradio" in sys.modules,
+        "gemini": "google.generativeai" in sys.modules,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    print(f"{'scenario':>9} {'median s':>9} {'min s':>7} {'peak RSS MB':>12} {'gradio':>7} {'gemini':>7}")
+    for scenario in SCENARIOS:
+        runs = []
+        for _ in range(args.repeat):
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", scenario],
+                check=True, capture_output=True, text=True, cwd=ROOT
+            ).stdout.strip().splitlines()[-1]
+            runs.append(json.loads(output))
+        seconds = [run["seconds"] for run in runs]
+        rss = statistics.median(run["peak_rss"] for run in runs)
+        print(f"{scenario:>9} {statistics.median(seconds):>9.3f} {min(seconds):>7.3f} {rss / 1e6:>12.1f} "
+              f"{str(runs[0]['gradio']):>7} {str(runs[0]['gemini']):>7}")
+
+
+if __name__ == "__main__":
+    main()
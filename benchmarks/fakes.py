@@ -0,0 +1,196 @@
+"""Deterministic offline stand-ins for Gemini, Edge TTS and the pyttsx3 pool.
+
+The fakes keep the interfaces app.py uses (``generate_content`` with and
+without ``stream``, ``edge_tts.Communicate(...).save``, ``Pyttsx3Pool.render``)
+and simulate their latency, so the real pipeline around them can be timed
+without network access or quota. Scripts are built from the prompt's own
+material and audio is a tone whose length follows the text, so the same
+inputs always produce the same work.
+
+    fakes.install(app, llm_latency=0.8, tts_latency=0.3)
+"""
+import asyncio
+import hashlib
+import io
+import re
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import soundfile as sf
+
+from gemini_pool import GeminiPool
+from mp3_splice import FrameHeader, read_frames
+
+SAMPLE_RATE = 24000
+# Pass as ``api_key`` to use the fake Gemini model
+API_KEY = "fake-key"
+# Roughly how fast the voices speak
+CHARS_PER_SECOND_OF_SPEECH = 15
+
+_NAMES = re.compile(r"hosts: ([^\n]+?)\.\s*\n")
+_SENTENCES = re.compile(r'(?<=[.!?])\s+')
+_MATERIAL = re.compile(r"(?:Original text|Material for this segment): (.*?)\n\s*\n\s*Format", re.DOTALL)
+
+
+def speech_seconds(text):
+    return max(0.25, len(text) / CHARS_PER_SECOND_OF_SPEECH)
+
+
+def _tone(voice, seconds):
+    # A different pitch per voice so turns are distinguishable when listening
+    pitch = 150 + int(hashlib.sha256(voice.encode()).hexdigest()[:4], 16) % 150
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.2 * np.sin(2 * np.pi * pitch * t)).astype(np.float32)
+
+
+class _AudioFactory:
+    """Encodes each (voice, duration) once; durations are quantized to 0.25 s"""
+
+    def __init__(self):
+        self._mp3 = {}
+        self._lock = threading.Lock()
+
+    def mp3(self, voice, text):
+        seconds = round(speech_seconds(text) * 4) / 4
+        key = (voice, seconds)
+        with self._lock:
+            data = self._mp3.get(key)
+        if data is None:
+            buffer = io.BytesIO()
+            # Constant bitrate like Edge TTS, so episodes take the splice path
+            with sf.SoundFile(buffer, "w", SAMPLE_RATE, 1, format="MP3", subtype="MPEG_LAYER_III",
+                              bitrate_mode="CONSTANT", compression_level=0.5) as out:
+                out.write(_tone(voice, seconds))
+            data = buffer.getvalue()
+            with self._lock:
+                self._mp3[key] = data
+        return data
+
+    def write_wav(self, voice, text, filename):
+        sf.write(filename, _tone(voice, speech_seconds(text)), SAMPLE_RATE, subtype="PCM_16")
+
+
+AUDIO = _AudioFactory()
+
+
+def fake_script(prompt, words_per_turn=40):
+    """Turn the material in a script prompt into a labelled conversation"""
+    names_match = _NAMES.search(prompt)
+    names = [name.strip() for name in names_match.group(1).split(",")] if names_match else ["Host"]
+    material_match = _MATERIAL.search(prompt)
+    words = (material_match.group(1) if material_match else prompt).split()
+    turns = []
+    for i in range(0, len(words), words_per_turn):
+        turns.append(f"{names[len(turns) % len(names)]}: {' '.join(words[i:i + words_per_turn])}")
+    return "\n\n".join(turns) + "\n"
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """``GenerativeModel`` stand-in: first-token latency plus output speed"""
+
+    def __init__(self, latency=0.8, chars_per_second=400, words_per_turn=40, stream_chunk_chars=80):
+        self.latency = latency
+        self.chars_per_second = chars_per_second
+        self.words_per_turn = words_per_turn
+        self.stream_chunk_chars = stream_chunk_chars
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        script = fake_script(prompt, self.words_per_turn)
+        if stream:
+            return self._stream(script)
+        time.sleep(self.latency + len(script) / self.chars_per_second)
+        return _Response(script)
+
+    def _stream(self, script):
+        time.sleep(self.latency)
+        step = self.stream_chunk_chars
+        for i in range(0, len(script), step):
+            time.sleep(step / self.chars_per_second)
+            yield _Response(script[i:i + step])
+
+
+class FakeConnector:
+    """Stands in for the shared aiohttp connector"""
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def shutdown(self):
+        pass
+
+
+def fake_edge_tts(latency=0.3, seconds_per_char=0.002):
+    """An ``edge_tts`` backend whose Communicate sleeps, then writes a CBR MP3
+
+    ``stream()`` voices every sentence separately and reports a
+    SentenceBoundary (offset and duration in 100 ns ticks) for each, like
+    Edge TTS does.
+    """
+
+    class FakeCommunicate:
+        def __init__(self, text, voice, rate=None, connector=None):
+            self.text = text
+            self.voice = voice
+
+        async def save(self, filename):
+            await asyncio.sleep(latency + len(self.text) * seconds_per_char)
+            data = AUDIO.mp3(self.voice, self.text)
+            with open(filename, "wb") as f:
+                f.write(data)
+
+        async def stream(self):
+            await asyncio.sleep(latency + len(self.text) * seconds_per_char)
+            offset = 0
+            for sentence in _SENTENCES.split(self.text.strip()):
+                _, frames = read_frames(AUDIO.mp3(self.voice, sentence))
+                duration = len(frames) * FrameHeader(bytes(frames[0][:4])).samples * 10 ** 7 // SAMPLE_RATE
+                yield {"type": "SentenceBoundary", "offset": offset, "duration": duration, "text": sentence}
+                yield {"type": "audio", "data": b"".join(frames)}
+                offset += duration
+
+    return types.SimpleNamespace(Communicate=FakeCommunicate, SharedTCPConnector=FakeConnector)
+
+
+class FakePyttsx3Pool:
+    """``Pyttsx3Pool`` stand-in rendering WAV files on ``workers`` threads"""
+
+    def __init__(self, workers=4, latency=0.2, seconds_per_char=0.004):
+        self.workers = workers
+        self.latency = latency
+        self.seconds_per_char = seconds_per_char
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def _render(self, text, filename, gender, slot):
+        start = time.perf_counter()
+        time.sleep(self.latency + len(text) * self.seconds_per_char)
+        AUDIO.write_wav(f"{gender}-{slot}", text, filename)
+        return filename, time.perf_counter() - start
+
+    def render(self, jobs):
+        futures = [self._executor.submit(self._render, *job) for job in jobs]
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def install(app, llm_latency=0.8, llm_chars_per_second=400, tts_latency=0.3, tts_seconds_per_char=0.002,
+            pyttsx3_workers=4):
+    """Point ``app`` at the fakes; returns the fake Gemini model (used for any ``api_key``)"""
+    model = FakeGeminiModel(llm_latency, llm_chars_per_second)
+    # No rate limiting against a fake, and no cap below the benchmark's own concurrency
+    app.GEMINI_CLIENTS = GeminiPool(lambda api_key: model, requests_per_minute=0, max_concurrent=1024)
+    app.BACKENDS.override("edge_tts", fake_edge_tts(tts_latency, tts_seconds_per_char))
+    app.BACKENDS.override("pyttsx3", FakePyttsx3Pool(pyttsx3_workers, tts_latency, tts_seconds_per_char * 2))
+    app.EDGE_TTS_AVAILABLE = True
+    return model
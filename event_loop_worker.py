@@ -0,0 +1,102 @@
+"""A long-lived asyncio event loop running on a background thread.
+
+Request handlers (Gradio worker threads, the CLI, ...) submit coroutines to
+one shared loop instead of creating and closing a loop per request. Anything
+bound to a loop, such as connection pools and semaphores, can therefore be
+reused across jobs and shared between concurrent users.
+"""
+import asyncio
+import threading
+
+
+class EventLoopWorker:
+    """Owns one event loop on a daemon thread; start() is called lazily"""
+
+    def __init__(self, name="podcast-event-loop"):
+        self.name = name
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def loop(self):
+        self.start()
+        return self._loop
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            self._loop = loop
+            self._thread = threading.Thread(target=run, name=self.name, daemon=True)
+            self._thread.start()
+            ready.wait()
+
+    def submit(self, coro):
+        """Schedule ``coro`` on the worker loop; returns a concurrent Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Run ``coro`` on the worker loop and block until it finishes"""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("EventLoopWorker.run() called from its own loop; await instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    async def iterate(self, agen):
+        """Drive an async generator on the worker loop from another event loop"""
+        # The latest __anext__, as a task on the worker loop
+        step = None
+
+        async def advance():
+            nonlocal step
+            step = asyncio.ensure_future(agen.__anext__())
+            return await step
+
+        async def close():
+            if step is not None and not step.done():
+                # The consumer was cancelled mid-step, which cancelled the step too;
+                # aclose() fails until the generator has unwound from it
+                await asyncio.wait([step])
+            await agen.aclose()
+
+        try:
+            while True:
+                future = self.submit(advance())
+                try:
+                    item = await asyncio.wrap_future(future)
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            # Let the generator run its cleanup on the loop that owns it
+            await asyncio.wrap_future(self.submit(close()))
+
+    def shutdown(self, timeout=5):
+        """Stop the loop and wait for the thread to exit"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
@@ -0,0 +1,172 @@
+"""Gemini models kept per API key, each with its own rate limits.
+
+``GeminiPool.get(api_key)`` hands out the same ``GeminiClient`` for a key on
+every request, so users with different keys never share or replace each
+other's model. Each client spaces call starts with a token bucket sized to
+the key's requests-per-minute quota and bounds its calls in flight with a
+semaphore. Quota errors (HTTP 429 / ResourceExhausted) are retried with
+exponential backoff, or after the server's retry delay when it sends one;
+the backoff drains the bucket, so every other caller of that key waits
+behind it instead of hitting the quota again.
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+def is_quota_error(error):
+    """Whether ``error`` is a rate-limit / quota rejection"""
+    return getattr(error, "code", None) == 429 or type(error).__name__ in ("ResourceExhausted", "TooManyRequests")
+
+
+def retry_delay(error):
+    """Seconds the server asked us to wait (google.rpc.RetryInfo), or None"""
+    for detail in getattr(error, "details", None) or ():
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None:
+            return delay.seconds + delay.nanos / 1e9
+    return None
+
+
+class TokenBucket:
+    """``per_minute`` tokens a minute, bursting up to ``burst``; 0 means unlimited"""
+
+    def __init__(self, per_minute, burst=1):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        # Only used without a rate, where there are no tokens to hold back
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take a token, sleeping until it is due; returns the seconds waited"""
+        with self._lock:
+            now = time.monotonic()
+            if not self.rate:
+                wait = max(0.0, self._resume_at - now)
+            else:
+                self._refill(now)
+                # Tokens go negative to reserve a place in line
+                self._tokens -= 1
+                wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def hold(self, seconds):
+        """Hand out no tokens for the next ``seconds``"""
+        with self._lock:
+            now = time.monotonic()
+            if not self.rate:
+                self._resume_at = max(self._resume_at, now + seconds)
+            else:
+                self._refill(now)
+                self._tokens = min(self._tokens, -seconds * self.rate)
+
+
+class GeminiClient:
+    """One key's model behind a token bucket, a concurrency limit and quota backoff"""
+
+    def __init__(self, model, requests_per_minute=60, burst=4, max_concurrent=4, retries=4, backoff=2.0,
+                 max_backoff=60.0, on_event=None):
+        self.model = model
+        self.bucket = TokenBucket(requests_per_minute, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.on_event = on_event or (lambda event: None)
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    def _request(self, prompt, **kwargs):
+        """Start a call holding a concurrency slot; on success the caller releases the slot"""
+        attempt = 0
+        while True:
+            self._slots.acquire()
+            if self.bucket.acquire():
+                self.on_event("throttled")
+            try:
+                return self.model.generate_content(prompt, **kwargs)
+            except Exception as e:
+                self._slots.release()
+                if not is_quota_error(e):
+                    raise
+                if attempt >= self.retries:
+                    self.on_event("quota_exhausted")
+                    raise
+                delay = min(self.max_backoff, max(retry_delay(e) or 0.0, self.backoff * 2 ** attempt))
+                self.on_event("quota_backoff")
+                logger.warning(f"⏳ Gemini quota hit, retrying in {delay:.1f}s (attempt {attempt + 1}/{self.retries})")
+                # Everyone on this key waits, not just this caller
+                self.bucket.hold(delay)
+                attempt += 1
+
+    def generate_content(self, prompt):
+        response = self._request(prompt)
+        self._slots.release()
+        return response
+
+    def stream_content(self, prompt):
+        """Yield the streamed response chunks; the slot is held until the stream ends"""
+        response = self._request(prompt, stream=True)
+        try:
+            yield from response
+        finally:
+            self._slots.release()
+
+
+class GeminiPool:
+    """A ``GeminiClient`` per API key around ``make_model(api_key)``
+
+    The least recently used clients beyond ``max_keys`` are dropped.
+    """
+
+    def __init__(self, make_model, requests_per_minute=60, burst=4, max_concurrent=4, retries=4, backoff=2.0,
+                 max_keys=64, on_event=None):
+        self.make_model = make_model
+        self.requests_per_minute = requests_per_minute
+        self.burst = burst
+        self.max_concurrent = max_concurrent
+        self.retries = retries
+        self.backoff = backoff
+        self.max_keys = max_keys
+        self.on_event = on_event
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key_id(api_key):
+        # Keys themselves are never used as dict keys or logged
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+    def get(self, api_key):
+        """The client for ``api_key``, created on first use; None for a blank key"""
+        api_key = (api_key or "").strip()
+        if not api_key:
+            return None
+        key_id = self._key_id(api_key)
+        with self._lock:
+            client = self._clients.get(key_id)
+            if client is not None:
+                self._clients.move_to_end(key_id)
+                return client
+        # Built outside the lock; if two requests race, the first stored wins
+        client = GeminiClient(
+            self.make_model(api_key), self.requests_per_minute, self.burst, self.max_concurrent, self.retries,
+            self.backoff, on_event=self.on_event
+        )
+        with self._lock:
+            client = self._clients.setdefault(key_id, client)
+            self._clients.move_to_end(key_id)
+            while len(self._clients) > self.max_keys:
+                self._clients.popitem(last=False)
+        return client
@@ -0,0 +1,233 @@
+"""Hedged, retried TTS calls with a fallback chain of engines.
+
+A ``TTSBackend`` wraps one engine behind a common coroutine:
+``synthesize(text, speaker_idx, speaker_count, filename) -> (filename, error)``.
+``HedgedSpeech`` tries engines in order. Each attempt has a timeout, failed
+attempts are retried with jittered exponential backoff, and when a request
+runs longer than the engine's recent latency percentile for turns of its
+length a second identical request is raised and whichever finishes first
+wins. Losing, timed-out and cancelled requests have their output files
+removed.
+
+Only real requests are timed. A backend's ``cached`` lookup runs before any
+request and never becomes a latency sample, and time spent queued for its
+``limit`` counts against neither the timeout, the hedge delay nor latency.
+"""
+import asyncio
+import contextlib
+import logging
+import os
+import random
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def _discard(filename):
+    try:
+        os.unlink(filename)
+    except OSError:
+        pass
+
+
+async def run_blocking(fn, *args):
+    """Run a blocking ``fn(*args) -> (filename, error)`` on a thread
+
+    Threads cannot be interrupted, so when the caller is cancelled the call
+    finishes in the background and any file it produced is deleted.
+    """
+    future = asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    def discard_late_result(done):
+        if not done.cancelled() and done.exception() is None and done.result()[0]:
+            _discard(done.result()[0])
+
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        future.add_done_callback(discard_late_result)
+        raise
+
+
+class TTSBackend:
+    """One engine: an async ``synthesize`` writing files with ``extension``
+
+    ``cached(text, speaker_idx, speaker_count, filename)`` returns the
+    filename when it could be filled from a cache, else None. ``limit()``
+    returns the async context manager every request of the engine runs in
+    (e.g. a semaphore shared with other callers).
+    """
+
+    def __init__(self, name, synthesize, extension, available=lambda: True, cached=None, limit=None):
+        self.name = name
+        self.synthesize = synthesize
+        self.extension = extension
+        self.available = available
+        self.cached = cached
+        self.limit = limit or contextlib.nullcontext
+
+
+class LatencyTracker:
+    """Sliding windows of successful call latencies, by text length
+
+    Turns fall into size classes whose lengths are within a factor of two of
+    each other. A class keeps seconds per character, so its percentile
+    scales to any turn of that size, and the fixed overhead that dominates
+    short turns never sets the bar for long ones (or the other way round).
+    """
+
+    def __init__(self, window=200):
+        self.window = window
+        self._classes = {}
+
+    @staticmethod
+    def _size_class(chars):
+        return max(1, chars).bit_length()
+
+    def add(self, seconds, chars):
+        samples = self._classes.setdefault(self._size_class(chars), deque(maxlen=self.window))
+        samples.append(seconds / max(1, chars))
+
+    def count(self, chars):
+        """Samples behind the estimate for a ``chars``-long turn"""
+        return len(self._classes.get(self._size_class(chars), ()))
+
+    def percentile(self, q, chars):
+        """Seconds within which a ``chars``-long turn finished in ``q`` percent of calls"""
+        ordered = sorted(self._classes[self._size_class(chars)])
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))] * max(1, chars)
+
+
+class HedgePolicy:
+    """Timeouts, retries and hedging thresholds shared by every engine
+
+    Until ``hedge_min_samples`` calls of similar length have succeeded, a
+    turn is hedged after ``initial_hedge_delay`` seconds; ``hedge_percentile=None`` turns
+    hedging off.
+    """
+
+    def __init__(self, timeout=30.0, retries=1, backoff=0.5, hedge_percentile=95,
+                 hedge_min_samples=20, initial_hedge_delay=5.0):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.initial_hedge_delay = initial_hedge_delay
+
+
+class HedgedSpeech:
+    """Synthesizes turns over ``backends`` in ``order`` under a HedgePolicy"""
+
+    def __init__(self, backends, order, policy=None, on_event=None):
+        self.backends = backends
+        self.order = list(order)
+        self.policy = policy or HedgePolicy()
+        # on_event(event, engine) for "timeout", "retry", "hedge", "hedge_won", "fallback"
+        self.on_event = on_event or (lambda event, engine: None)
+        self._latency = {name: LatencyTracker() for name in backends}
+
+    def hedge_delay(self, name, text):
+        """Seconds before ``text`` is hedged on engine ``name``, or None for never"""
+        policy = self.policy
+        if policy.hedge_percentile is None:
+            return None
+        tracker = self._latency[name]
+        if tracker.count(len(text)) < policy.hedge_min_samples:
+            return policy.initial_hedge_delay
+        return tracker.percentile(policy.hedge_percentile, len(text))
+
+    async def _call(self, backend, text, speaker_idx, speaker_count, filename, started=None):
+        try:
+            async with backend.limit():
+                if started is not None:
+                    started.set()
+                start = time.perf_counter()
+                result, error = await asyncio.wait_for(
+                    backend.synthesize(text, speaker_idx, speaker_count, filename), self.policy.timeout
+                )
+        except asyncio.TimeoutError:
+            self.on_event("timeout", backend.name)
+            _discard(filename)
+            return None, f"timed out after {self.policy.timeout:g}s"
+        except asyncio.CancelledError:
+            _discard(filename)
+            raise
+        except Exception as e:
+            result, error = None, str(e)
+        if result:
+            self._latency[backend.name].add(time.perf_counter() - start, len(text))
+        else:
+            _discard(filename)
+        return result, error
+
+    async def _hedged_call(self, backend, text, speaker_idx, speaker_count, base):
+        args = (backend, text, speaker_idx, speaker_count)
+        started = asyncio.Event()
+        primary = asyncio.ensure_future(self._call(*args, f"{base}a{backend.extension}", started))
+        queued = asyncio.ensure_future(started.wait())
+        pending = {primary, queued}
+        outcome = (None, "no result")
+        try:
+            delay = self.hedge_delay(backend.name, text)
+            if delay is not None:
+                # The hedge delay runs from when the request starts, not while it waits for the limit
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+
+            self.on_event("hedge", backend.name)
+            hedge = asyncio.ensure_future(self._call(*args, f"{base}b{backend.extension}"))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result, error = task.result()
+                    if result:
+                        if task is hedge:
+                            self.on_event("hedge_won", backend.name)
+                        return result, None
+                    outcome = (None, error)
+            return outcome
+        finally:
+            queued.cancel()
+            for task in pending:
+                task.cancel()
+            # Let the losers delete their partial files
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def synthesize(self, text, speaker_idx, speaker_count, base, order=None):
+        """Render one turn; returns ``(filename, error, engine_name)``
+
+        ``base`` is a path prefix: every attempt appends its own suffix and
+        the engine's extension, so the returned filename tells which won.
+        ``order`` overrides the engines tried for this call.
+        """
+        errors = []
+        tried = 0
+        for name in order or self.order:
+            backend = self.backends.get(name)
+            if backend is None or not backend.available():
+                continue
+            if tried:
+                self.on_event("fallback", name)
+                logger.warning(f"↪️ Falling back to {name} TTS")
+            tried += 1
+            if backend.cached is not None:
+                result = await backend.cached(text, speaker_idx, speaker_count, f"{base}-{name}c{backend.extension}")
+                if result:
+                    return result, None, name
+            for attempt in range(self.policy.retries + 1):
+                if attempt:
+                    self.on_event("retry", name)
+                    await asyncio.sleep(self.policy.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+                result, error = await self._hedged_call(
+                    backend, text, speaker_idx, speaker_count, f"{base}-{name}{attempt}"
+                )
+                if result:
+                    return result, None, name
+                errors.append(f"{name}: {error}")
+                logger.debug(f"{name} TTS attempt {attempt + 1} failed: {error}")
+        return None, "; ".join(errors) or "No TTS engine available", None
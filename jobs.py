@@ -0,0 +1,162 @@
+"""Background podcast jobs with single-flight deduplication.
+
+``JobManager.submit`` returns a job id immediately and runs the work on a
+small thread pool. Requests whose inputs hash to the same key while a job
+for that key is still queued or running are attached to that job instead
+of starting another one, so every waiter gets the same finished artifact
+and worker slots go to distinct work. Finished jobs stay queryable for
+``keep_seconds``.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class Job:
+    """State of one execution; shared by every request coalesced onto it"""
+
+    def __init__(self, job_id, key):
+        self.id = job_id
+        self.key = key
+        self.status = QUEUED
+        self.progress = 0.0
+        self.message = "Queued"
+        self.result = None
+        self.error = None
+        self.waiters = 1
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self._done = threading.Event()
+
+    @property
+    def is_finished(self):
+        return self._done.is_set()
+
+    def update(self, fraction, desc=None):
+        """``gr.Progress``-compatible progress callback"""
+        self.progress = float(fraction)
+        if desc:
+            self.message = desc
+
+    def snapshot(self):
+        return {
+            "id": self.id,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "waiters": self.waiters,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class JobManager:
+    """Runs ``run(progress, **params)`` on ``max_workers`` threads, one job per distinct ``params``"""
+
+    def __init__(self, run, max_workers=4, keep_seconds=3600):
+        self.run = run
+        self.max_workers = max_workers
+        self.keep_seconds = keep_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="podcast-job")
+        self._jobs = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "coalesced": 0, "completed": 0, "failed": 0}
+
+    @staticmethod
+    def make_key(params):
+        """Hash of everything that determines a job's result"""
+        payload = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def submit(self, **params):
+        """Start (or join) the job for ``params``; returns its id without waiting"""
+        key = self.make_key(params)
+        with self._lock:
+            self._prune()
+            self._stats["submitted"] += 1
+            job = self._inflight.get(key)
+            if job is not None:
+                job.waiters += 1
+                self._stats["coalesced"] += 1
+                logger.info(f"🔗 Joined in-flight job {job.id} ({job.waiters} waiters)")
+                return job.id
+            job = Job(uuid4().hex[:12], key)
+            self._jobs[job.id] = job
+            self._inflight[key] = job
+        self._executor.submit(self._execute, job, params)
+        return job.id
+
+    def _execute(self, job, params):
+        job.status = RUNNING
+        job.started = time.time()
+        try:
+            job.result = self.run(job.update, **params)
+            job.status = DONE
+            job.progress = 1.0
+        except Exception as e:
+            logger.error(f"❌ Job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished = time.time()
+            with self._lock:
+                # Later identical requests start a fresh job
+                if self._inflight.get(job.key) is job:
+                    del self._inflight[job.key]
+                self._stats["completed" if job.status == DONE else "failed"] += 1
+            job._done.set()
+
+    def _prune(self):
+        cutoff = time.time() - self.keep_seconds
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished is not None and job.finished < cutoff]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def status(self, job_id):
+        """Snapshot dict of a job, or None for unknown (or expired) ids"""
+        job = self.get(job_id)
+        return job.snapshot() if job else None
+
+    def wait(self, job_id, timeout=None):
+        """Block until the job finishes and return its result
+
+        Raises KeyError for unknown ids, TimeoutError if ``timeout`` passes
+        first and RuntimeError if the job failed.
+        """
+        job = self.get(job_id)
+        if job is None:
+            raise KeyError(job_id)
+        if not job._done.wait(timeout):
+            raise TimeoutError(f"Job {job_id} still {job.status}")
+        if job.status == FAILED:
+            raise RuntimeError(job.error)
+        return job.result
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._inflight)
+            stats["tracked"] = len(self._jobs)
+        return stats
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,194 @@
+"""Per-stage timing spans exported as Prometheus text-format metrics.
+
+Each pipeline stage (script generation, parsing, per-turn synthesis,
+assembly, export) runs inside ``Metrics.span``, which records its duration
+in a histogram labelled by stage, engine and speaker count, counts the
+characters it processed and logs the span at DEBUG level. ``serve`` exposes
+the metrics at ``/metrics`` on a local port for Prometheus to scrape.
+"""
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Seconds; covers a cached segment up to a long Gemini call or a full episode
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+STAGE_LABELS = ("stage", "engine", "speakers")
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a fixed tuple of label names"""
+
+    def __init__(self, name, help_text, label_names, buckets=STAGE_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # Per-bucket counts (last slot is +Inf), sum, count
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def totals(self):
+        """``{label_values: (count, sum)}`` for every series"""
+        with self._lock:
+            return {labels: (count, total) for labels, (_, total, count) in self._series.items()}
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: (list(counts), total, count) for labels, (counts, total, count) in self._series.items()}
+        for labels, (counts, total, count) in sorted(series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                label_text = _format_labels(self.label_names, labels, [("le", bound)])
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {total}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter keyed by a fixed tuple of label names"""
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Span:
+    """A running stage; set ``characters`` once the amount of text is known"""
+
+    __slots__ = ("stage", "engine", "speakers", "characters")
+
+    def __init__(self, stage, engine, speakers, characters):
+        self.stage = stage
+        self.engine = engine
+        self.speakers = speakers
+        self.characters = characters
+
+
+class Metrics:
+    """Stage timings and character counts for one process"""
+
+    def __init__(self):
+        self.stage_seconds = Histogram(
+            "podcast_stage_seconds", "Time spent in each pipeline stage", STAGE_LABELS
+        )
+        self.stage_characters = Counter(
+            "podcast_stage_characters_total", "Characters processed by each pipeline stage", STAGE_LABELS
+        )
+        self.stage_failures = Counter(
+            "podcast_stage_failures_total", "Pipeline stages that raised an exception", STAGE_LABELS
+        )
+        self.tts_events = Counter(
+            "podcast_tts_events_total", "TTS timeouts, retries, hedged requests and engine fallbacks",
+            ("event", "engine")
+        )
+        self.gemini_events = Counter(
+            "podcast_gemini_events_total", "Gemini calls delayed by the rate limit, backed off or failed on quota",
+            ("event",)
+        )
+
+    def record(self, stage, seconds, engine="", speakers="", characters=0, failed=False):
+        """Record a stage timed elsewhere (e.g. in another process)"""
+        labels = (stage, engine or "none", str(speakers or "none"))
+        self.stage_seconds.observe(seconds, *labels)
+        if characters:
+            self.stage_characters.inc(characters, *labels)
+        if failed:
+            self.stage_failures.inc(1, *labels)
+        logger.debug(
+            "span stage=%s engine=%s speakers=%s chars=%d seconds=%.3f%s",
+            stage, engine, speakers, characters, seconds, " failed" if failed else ""
+        )
+
+    def tts_event(self, event, engine=""):
+        """Count one occurrence of ``event`` (e.g. a hedged TTS request)"""
+        self.tts_events.inc(1, event, engine or "none")
+
+    def gemini_event(self, event):
+        """Count one Gemini rate-limit or quota ``event``"""
+        self.gemini_events.inc(1, event)
+
+    @contextmanager
+    def span(self, stage, engine="", speakers="", characters=0):
+        """Time the enclosed block as one ``stage``; exceptions count as failures"""
+        span = Span(stage, engine, speakers, characters)
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield span
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.record(span.stage, time.perf_counter() - start, span.engine, span.speakers,
+                        span.characters, failed)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines = (self.stage_seconds.render() + self.stage_characters.render() + self.stage_failures.render()
+                 + self.tts_events.render() + self.gemini_events.render())
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve ``/metrics`` from a daemon thread; returns the server"""
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        return server
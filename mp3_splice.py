@@ -0,0 +1,189 @@
+"""Join MP3 segments frame by frame, without decoding or re-encoding.
+
+Edge TTS (and gTTS) return constant-bitrate MPEG Layer III streams. When every
+segment shares the same MPEG version, sample rate, channel mode and bitrate,
+an episode is just their frames back to back. Each segment starts a fresh bit
+reservoir, so frames can be spliced at segment boundaries. Gaps are filled
+with silent frames generated here: a header followed by all-zero side
+information (no main data, no reservoir use), which every decoder renders as
+digital silence. ``split_mp3`` goes the other way and cuts one stream (a
+batched request voicing several turns) into per-turn files.
+"""
+
+# Layer III bitrates (kbit/s) by bitrate index
+BITRATES = {
+    "1": [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    "2": [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG-1
+    2: [22050, 24000, 16000],  # MPEG-2
+    0: [11025, 12000, 8000],   # MPEG-2.5
+}
+MONO = 3
+
+
+class FrameHeader:
+    """The fields of a Layer III frame header that splicing cares about"""
+
+    __slots__ = ("raw", "version", "bitrate", "sample_rate", "channel_mode", "padding", "crc")
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.version = (raw[1] >> 3) & 3
+        self.crc = not (raw[1] & 1)
+        bitrate_index = raw[2] >> 4
+        self.bitrate = BITRATES["1" if self.version == 3 else "2"][bitrate_index]
+        self.sample_rate = SAMPLE_RATES[self.version][(raw[2] >> 2) & 3]
+        self.padding = (raw[2] >> 1) & 1
+        self.channel_mode = raw[3] >> 6
+
+    @classmethod
+    def parse(cls, data, offset):
+        """Return the header at ``offset`` or None if it is not a Layer III frame"""
+        if offset + 4 > len(data) or data[offset] != 0xFF or (data[offset + 1] & 0xE0) != 0xE0:
+            return None
+        raw = bytes(data[offset:offset + 4])
+        version = (raw[1] >> 3) & 3
+        layer = (raw[1] >> 1) & 3
+        bitrate_index = raw[2] >> 4
+        sample_rate_index = (raw[2] >> 2) & 3
+        # Reserved version, not Layer III, free format / bad bitrate, reserved rate
+        if version == 1 or layer != 1 or bitrate_index in (0, 15) or sample_rate_index == 3:
+            return None
+        return cls(raw)
+
+    @property
+    def samples(self):
+        return 1152 if self.version == 3 else 576
+
+    @property
+    def length(self):
+        coefficient = 144 if self.version == 3 else 72
+        return coefficient * self.bitrate * 1000 // self.sample_rate + self.padding
+
+    @property
+    def side_info_length(self):
+        if self.version == 3:
+            return 17 if self.channel_mode == MONO else 32
+        return 9 if self.channel_mode == MONO else 17
+
+    @property
+    def stream_params(self):
+        """Parameters that must match for two streams to be spliced"""
+        return (self.version, self.sample_rate, self.channel_mode, self.bitrate)
+
+
+def _skip_id3v2(data):
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+
+def _is_info_frame(data, offset, header):
+    """Xing/Info/VBRI metadata frames carry no audio"""
+    tag_offset = offset + 4 + (2 if header.crc else 0) + header.side_info_length
+    return (data[tag_offset:tag_offset + 4] in (b"Xing", b"Info")
+            or data[offset + 36:offset + 40] == b"VBRI")
+
+
+def read_frames(data):
+    """Split MP3 bytes into audio frames
+
+    Returns ``(stream_params, frames)`` where ``frames`` are memoryviews, or
+    None if the data is not a constant-bitrate Layer III stream.
+    """
+    data = memoryview(data)
+    end = len(data)
+    if end >= 128 and bytes(data[end - 128:end - 125]) == b"TAG":
+        end -= 128
+    offset = _skip_id3v2(data)
+    params = None
+    frames = []
+    while offset < end:
+        header = FrameHeader.parse(data, offset)
+        if header is None:
+            if frames:
+                # Trailing junk after the last frame
+                break
+            return None
+        frame_end = offset + header.length
+        if frame_end > end:
+            break
+        if not frames and _is_info_frame(data, offset, header):
+            offset = frame_end
+            continue
+        if params is None:
+            params = header.stream_params
+        elif header.stream_params != params:
+            return None
+        frames.append(data[offset:frame_end])
+        offset = frame_end
+    if not frames:
+        return None
+    return params, frames
+
+
+def silent_frame(header):
+    """A frame with no CRC, no padding and zeroed side information"""
+    raw = bytes([header.raw[0], header.raw[1] | 0x01, header.raw[2] & ~0x02, header.raw[3]])
+    template = FrameHeader(raw)
+    return raw + bytes(template.length - 4)
+
+
+def splice_mp3(paths, output_path, gap_ms):
+    """Concatenate MP3 files frame by frame with silent frames between them
+
+    ``gap_ms`` is a single pause or one per gap. Returns False without
+    writing anything when the segments cannot be spliced (different stream
+    parameters, VBR or non-MP3 input); the caller should then transcode.
+    """
+    streams = []
+    for path in paths:
+        with open(path, "rb") as f:
+            parsed = read_frames(f.read())
+        if parsed is None:
+            return False
+        streams.append(parsed)
+    if len({params for params, _ in streams}) != 1:
+        return False
+
+    gaps = list(gap_ms) if not isinstance(gap_ms, (int, float)) else [gap_ms] * (len(streams) - 1)
+    if len(gaps) != len(streams) - 1:
+        raise ValueError(f"Expected {len(streams) - 1} gaps, got {len(gaps)}")
+    header = FrameHeader(bytes(streams[0][1][0][:4]))
+    silence = silent_frame(header)
+    frame_ms = 1000.0 * header.samples / header.sample_rate
+
+    with open(output_path, "wb") as out:
+        for i, (_, frames) in enumerate(streams):
+            for frame in frames:
+                out.write(frame)
+            if i < len(gaps) and gaps[i] > 0:
+                out.write(silence * int(round(gaps[i] / frame_ms)))
+    return True
+
+
+def split_mp3(data, cut_seconds, paths):
+    """Cut one MP3 stream into ``len(cut_seconds) + 1`` files at frame boundaries
+
+    Cuts are rounded to the nearest frame. A frame may borrow bits from the
+    frames before it, so cuts belong in pauses, where the one frame that loses
+    its reservoir decodes as (near) silence. Returns False without writing
+    anything when ``data`` is not a constant-bitrate Layer III stream.
+    """
+    parsed = read_frames(data)
+    if parsed is None:
+        return False
+    _, frames = parsed
+    header = FrameHeader(bytes(frames[0][:4]))
+    frame_seconds = header.samples / header.sample_rate
+    bounds = [0] + [min(len(frames), max(0, int(round(cut / frame_seconds)))) for cut in cut_seconds]
+    bounds.append(len(frames))
+    for path, start, end in zip(paths, bounds, bounds[1:]):
+        with open(path, "wb") as out:
+            for frame in frames[start:max(start, end)]:
+                out.write(frame)
+    return True
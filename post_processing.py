@@ -0,0 +1,203 @@
+"""Whole-episode post-processing on one NumPy buffer.
+
+Segments are measured from their headers, then decoded one at a time and
+written with their gain applied straight into a single preallocated episode
+array (``np.multiply(..., out=)``, no per-segment intermediate copies). Consecutive segments are separated by a
+gap of silence or overlapped with an equal-power crossfade, and an optional
+background bed is mixed under the whole episode. Segments not already at the
+output rate are resampled once, straight to it.
+
+Loudness is the gated mean power of 50 ms blocks, in the spirit of
+ITU-R BS.1770 without the K-weighting filter: blocks below -70 dBFS, or
+more than 10 dB below the ungated mean, do not count. Each segment is scaled
+to ``loudness_db`` unless that would push its peak over ``peak_db``.
+"""
+from collections import Counter
+from math import gcd
+
+import numpy as np
+import soundfile as sf
+
+from audio_assembly import OPUS_SAMPLE_RATES, OUTPUT_FORMATS, _gap_frames, conform, read_segment
+
+BLOCK_SECONDS = 0.05
+ABSOLUTE_GATE_DB = -70.0
+RELATIVE_GATE_DB = -10.0
+
+
+class PostProcess:
+    """Post-processing settings; ``None``/0 turns a step off
+
+    ``crossfade_ms`` replaces every pause between two speakers with an
+    overlap of that length. ``bed`` is a path or ``(array, sample_rate)``
+    looped under the episode at ``bed_db`` relative to full scale.
+    ``sample_rate`` is the output rate (default: the segments' own).
+    """
+
+    def __init__(self, loudness_db=-20.0, peak_db=-1.0, crossfade_ms=0, edge_fade_ms=5, bed=None,
+                 bed_db=-30.0, bed_fade_ms=2000, sample_rate=None):
+        self.loudness_db = loudness_db
+        self.peak_db = peak_db
+        self.crossfade_ms = crossfade_ms
+        self.edge_fade_ms = edge_fade_ms
+        self.bed = bed
+        self.bed_db = bed_db
+        self.bed_fade_ms = bed_fade_ms
+        self.sample_rate = sample_rate
+
+    @property
+    def active(self):
+        """Whether the episode must be decoded (False keeps MP3 splicing possible)"""
+        return bool(self.loudness_db is not None or self.crossfade_ms or self.bed is not None or self.sample_rate)
+
+
+def loudness_db(data, sample_rate):
+    """Gated loudness of ``data`` in dBFS, or None for silence"""
+    block = max(1, int(sample_rate * BLOCK_SECONDS))
+    blocks = len(data) // block
+    if blocks == 0:
+        view = data.reshape(1, -1)
+    else:
+        # A view of whole blocks; the tail shorter than one block is ignored
+        view = data[:blocks * block].reshape(blocks, -1)
+    power = np.einsum("ij,ij->i", view, view) / view.shape[1]
+    power = power[power > 10 ** (ABSOLUTE_GATE_DB / 10)]
+    if not len(power):
+        return None
+    power = power[power > power.mean() * 10 ** (RELATIVE_GATE_DB / 10)]
+    return 10 * np.log10(power.mean())
+
+
+def segment_gain(data, sample_rate, target_db, peak_db):
+    """Linear gain that brings ``data`` to ``target_db`` without clipping past ``peak_db``"""
+    if target_db is None:
+        return 1.0
+    level = loudness_db(data, sample_rate)
+    peak = float(np.abs(data).max()) if len(data) else 0.0
+    if level is None or peak == 0.0:
+        return 1.0
+    gain_db = min(target_db - level, peak_db - 20 * np.log10(peak))
+    return float(10 ** (gain_db / 20))
+
+
+def _ramp(length, rising):
+    ramp = np.linspace(0.0, 1.0, length, dtype=np.float32)
+    return (ramp if rising else ramp[::-1])[:, None]
+
+
+def _equal_power(length):
+    t = np.linspace(0.0, np.pi / 2, length, dtype=np.float32)[:, None]
+    return np.cos(t), np.sin(t)
+
+
+def _mix_bed(episode, sample_rate, post):
+    bed, rate = read_segment(post.bed)
+    bed = conform(bed, rate, sample_rate, episode.shape[1])
+    if not len(bed):
+        return
+    bed = bed * np.float32(10 ** (post.bed_db / 20))
+    total = len(episode)
+    fade = max(1, min(int(sample_rate * post.bed_fade_ms / 1000), total // 2))
+    # Loop the bed under the episode one bed-length at a time; only the
+    # chunks that touch the fade-in or fade-out are copied
+    for start in range(0, total, len(bed)):
+        end = min(start + len(bed), total)
+        layer = bed[:end - start]
+        if start < fade or end > total - fade:
+            index = np.arange(start, end, dtype=np.float32)
+            envelope = np.minimum(1.0, np.minimum((index + 1) / fade, (total - index) / fade))
+            layer = layer * envelope[:, None]
+        episode[start:end] += layer
+
+
+def _probe(source):
+    """Return ``(frames, sample_rate, channels)`` of a segment without keeping its samples"""
+    if isinstance(source, tuple):
+        data, rate = source
+        shape = np.shape(data)
+        return shape[0], rate, shape[1] if len(shape) > 1 else 1
+    try:
+        info = sf.info(source)
+        return info.frames, info.samplerate, info.channels
+    except (RuntimeError, TypeError):
+        # Only formats libsndfile cannot read are decoded just to be measured
+        data, rate = read_segment(source)
+        return len(data), rate, data.shape[1]
+
+
+def _resampled_frames(frames, rate, sample_rate):
+    """Length of ``frames`` after conform() takes them from ``rate`` to ``sample_rate``"""
+    factor = gcd(int(rate), int(sample_rate))
+    up, down = sample_rate // factor, rate // factor
+    return -(-frames * up // down)
+
+
+def render_episode(sources, gap_ms, post, allowed_rates=None):
+    """Decode, level, space and mix ``sources`` into one array
+
+    ``gap_ms`` is one pause or one per gap, as for assemble_segments. When
+    the output rate is not in ``allowed_rates`` (e.g. for Opus), 48 kHz is
+    used instead. Segments are measured first and then decoded one at a
+    time into the episode, so peak memory is the episode plus one segment.
+    Returns ``(frames x channels float32 array, sample_rate)``.
+    """
+    if not sources:
+        raise ValueError("No segments to post-process")
+    layouts = [_probe(source) for source in sources]
+    # Work at the output rate, or else at the most common native rate so most
+    # segments are never resampled; either way no sample is resampled twice
+    work_rate = post.sample_rate or Counter(rate for _, rate, _ in layouts).most_common(1)[0][0]
+    if allowed_rates is not None and work_rate not in allowed_rates:
+        work_rate = 48000
+    channels = layouts[0][2]
+    lengths = [_resampled_frames(frames, rate, work_rate) for frames, rate, _ in layouts]
+
+    gaps = _gap_frames(gap_ms, len(sources), work_rate)
+    if post.crossfade_ms:
+        crossfade = int(work_rate * post.crossfade_ms / 1000)
+        gaps = [-crossfade if gap > 0 else gap for gap in gaps]
+    starts = [0]
+    for i, gap in enumerate(gaps):
+        # An overlap never exceeds half of either segment
+        gap = max(gap, -min(lengths[i], lengths[i + 1]) // 2)
+        gaps[i] = gap
+        starts.append(starts[-1] + lengths[i] + gap)
+    total = starts[-1] + lengths[-1]
+
+    episode = np.zeros((total, channels), dtype=np.float32)
+    edge = int(work_rate * post.edge_fade_ms / 1000)
+    for i, start in enumerate(starts):
+        data, rate = read_segment(sources[i])
+        data = conform(data, rate, work_rate, channels)
+        if len(data) != lengths[i]:
+            # A header that miscounts frames must not shift every later segment
+            data = data[:lengths[i]] if len(data) > lengths[i] else np.pad(data, ((0, lengths[i] - len(data)), (0, 0)))
+        gain = np.float32(segment_gain(data, work_rate, post.loudness_db, post.peak_db))
+        overlap = -gaps[i - 1] if i and gaps[i - 1] < 0 else 0
+        end = start + len(data)
+        np.multiply(data[overlap:], gain, out=episode[start + overlap:end])
+        if overlap:
+            fade_out, fade_in = _equal_power(overlap)
+            episode[start:start + overlap] *= fade_out
+            episode[start:start + overlap] += data[:overlap] * (gain * fade_in)
+        # Short ramps where a segment meets silence, so cuts never click
+        if edge and len(data) > 2 * edge:
+            if not overlap:
+                episode[start:start + edge] *= _ramp(edge, True)
+            if i == len(starts) - 1 or gaps[i] >= 0:
+                episode[end - edge:end] *= _ramp(edge, False)
+
+    if post.bed is not None:
+        _mix_bed(episode, work_rate, post)
+        np.clip(episode, -1.0, 1.0, out=episode)
+    return episode, work_rate
+
+
+def process_episode(sources, output_path, output_format="wav", gap_ms=500, post=None):
+    """Post-process ``sources`` into ``output_path`` in ``output_format``"""
+    format, subtype, _ = OUTPUT_FORMATS[output_format]
+    episode, sample_rate = render_episode(
+        sources, gap_ms, post or PostProcess(), OPUS_SAMPLE_RATES if subtype == "OPUS" else None
+    )
+    sf.write(output_path, episode, sample_rate, format=format, subtype=subtype)
+    return output_path
@@ -0,0 +1,103 @@
+"""Process pool of pre-initialized pyttsx3 engines for offline synthesis.
+
+``pyttsx3.init()`` and the voice scan are expensive, and one engine renders
+on one core. Each pool process initializes its engine and voice list once,
+then renders speaker turns in parallel with a voice picked per speaker.
+Pool processes are spawned rather than forked: forking the app would copy
+its memory into every worker and could leave a child stuck on a lock that
+one of the app's threads held at the time.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# Substrings that identify voice genders across the SAPI5, NSSpeech and espeak drivers
+FEMALE_HINTS = ("female", "zira", "hazel", "susan", "samantha", "victoria", "karen", "f1", "f2", "f3", "f4")
+MALE_HINTS = ("male", "david", "mark", "george", "daniel", "alex", "fred", "m1", "m2", "m3", "m4")
+
+_engine = None
+_voices = []
+
+
+def _voice_gender(voice):
+    """Best-effort gender of a pyttsx3 voice, or None if unknown"""
+    gender = str(getattr(voice, "gender", "") or "").lower()
+    if gender in ("female", "male"):
+        return gender
+    name = f"{voice.name} {voice.id}".lower()
+    if any(hint in name for hint in FEMALE_HINTS):
+        return "female"
+    if any(hint in name for hint in MALE_HINTS):
+        return "male"
+    return None
+
+
+def pick_voice_id(voices, gender, slot):
+    """Pick a voice for ``gender``, spreading speaker ``slot``s over matching voices"""
+    if not voices:
+        return None
+    matching = [voice for voice in voices if _voice_gender(voice) == gender]
+    candidates = matching or voices
+    return candidates[slot % len(candidates)].id
+
+
+def _init_worker(rate, volume):
+    global _engine, _voices
+    import pyttsx3
+
+    _engine = pyttsx3.init()
+    _engine.setProperty('rate', rate)
+    _engine.setProperty('volume', volume)
+    _voices = list(_engine.getProperty('voices') or [])
+
+
+def _render(text, filename, gender, slot):
+    start = time.perf_counter()
+    voice_id = pick_voice_id(_voices, gender, slot)
+    if voice_id is not None:
+        _engine.setProperty('voice', voice_id)
+    _engine.save_to_file(text, filename)
+    _engine.runAndWait()
+    return filename, time.perf_counter() - start
+
+
+class Pyttsx3Pool:
+    """Renders pyttsx3 jobs across ``workers`` processes (default: one per core)"""
+
+    def __init__(self, workers=None, rate=180, volume=0.9):
+        self.workers = workers or os.cpu_count() or 1
+        self.rate = rate
+        self.volume = volume
+        self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.rate, self.volume)
+            )
+        return self._executor
+
+    def render(self, jobs):
+        """Render ``(text, filename, gender, slot)`` jobs
+
+        Returns ``(filename, render_seconds)`` per job, in order.
+
+        Raises the first job's exception. A pool whose process died is
+        discarded so the next call starts a fresh one.
+        """
+        try:
+            futures = [self._pool().submit(_render, *job) for job in jobs]
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            self.shutdown()
+            raise
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
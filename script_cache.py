@@ -0,0 +1,68 @@
+"""Persistent cache of generated podcast scripts.
+
+Re-rendering an episode with a different TTS engine produces the exact same
+Gemini request, so scripts are cached on disk keyed by everything that shapes
+the prompt. Entries expire after a time-to-live and share the size-bounded
+LRU eviction and atomic writes of SegmentCache.
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+
+from segment_cache import SegmentCache
+
+logger = logging.getLogger(__name__)
+
+
+class ScriptCache(SegmentCache):
+    """Size-bounded LRU cache of scripts with a time-to-live"""
+
+    def __init__(self, directory, max_bytes=64 * 1024 * 1024, ttl_seconds=7 * 24 * 3600):
+        super().__init__(directory, max_bytes=max_bytes)
+        self.ttl_seconds = ttl_seconds
+        self._stats["expired"] = 0
+
+    @staticmethod
+    def make_key(text, speaker_count, model, prompt_version, long_form=False):
+        """Hash the inputs that determine the generated script"""
+        # The text is hashed verbatim: long-form chunking depends on its line breaks
+        payload = json.dumps(
+            [text, speaker_count, model, prompt_version, bool(long_form)],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached script, or None on a miss or an expired entry"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Script cache read failed for {key[:12]}: {e}")
+            self._count("misses")
+            return None
+
+        if self.ttl_seconds and time.time() - entry["created"] > self.ttl_seconds:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            self._count("expired")
+            self._count("misses")
+            return None
+
+        # Refresh the entry's position in the LRU order
+        os.utime(path)
+        self._count("hits")
+        return entry["script"]
+
+    def put(self, key, script):
+        """Atomically store a script"""
+        data = json.dumps({"created": time.time(), "script": script}, ensure_ascii=False)
+        return self._write_atomic(key, lambda dst: dst.write(data.encode("utf-8")))
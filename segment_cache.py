@@ -0,0 +1,194 @@
+"""Content-addressed on-disk cache for synthesized speech segments.
+
+Entries are keyed by a hash of (engine, voice, rate, normalized text) and
+stored as flat files in one directory, so several worker processes can
+share the same cache. Writes go to a temp file that is atomically renamed
+into place; file modification times double as the LRU clock.
+
+Stores keep a running byte total instead of scanning the directory. The
+directory is only scanned when that total passes the budget (eviction then
+goes down to ``low_water`` of it, so the next scan is many stores away) or
+every ``rescan_seconds``, which also picks up other processes' writes.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+TEMP_PREFIX = ".tmp-"
+# Temp files older than this are leftovers from a crashed writer
+STALE_TEMP_SECONDS = 3600
+# Resync the running total with the disk at least this often
+RESCAN_SECONDS = 300
+
+
+def normalize_text(text):
+    """Collapse whitespace so trivially different turns share an entry"""
+    return " ".join(str(text).split())
+
+
+class SegmentCache:
+    """Size-bounded LRU cache of synthesized audio files"""
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, low_water=0.9, rescan_seconds=RESCAN_SECONDS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.rescan_seconds = rescan_seconds
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "scans": 0}
+        # Bytes on disk as of the last scan plus this process's stores; None until the first scan
+        self._bytes = None
+        self._next_scan = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(engine, voice, rate, text):
+        """Hash the inputs that determine the synthesized audio"""
+        payload = json.dumps(
+            [engine, voice, rate, normalize_text(text)],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def fetch(self, key, destination):
+        """Copy a cached segment to ``destination``; returns True on a hit"""
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, destination)
+            # Refresh the entry's position in the LRU order
+            os.utime(path)
+        except FileNotFoundError:
+            self._count("misses")
+            return False
+        except OSError as e:
+            logger.warning(f"Segment cache read failed for {key[:12]}: {e}")
+            self._count("misses")
+            return False
+        self._count("hits")
+        return True
+
+    def _write_atomic(self, key, write):
+        """Write an entry via ``write(file)`` into a temp file, then rename it into place"""
+        fd, temp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=self.directory)
+        path = self._path(key)
+        try:
+            with os.fdopen(fd, "wb") as dst:
+                write(dst)
+            size = os.path.getsize(temp_path)
+            try:
+                # An overwritten entry no longer counts
+                size -= os.path.getsize(path)
+            except FileNotFoundError:
+                pass
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Cache write failed for {key[:12]}: {e}")
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            return False
+        self._count("stores")
+        with self._lock:
+            if self._bytes is not None:
+                self._bytes += size
+            due = self._bytes is None or self._bytes > self.max_bytes or time.monotonic() >= self._next_scan
+        if due:
+            self.evict()
+        return True
+
+    def store(self, key, source):
+        """Atomically add ``source`` to the cache, then enforce the size budget"""
+        def copy(dst):
+            with open(source, "rb") as src:
+                shutil.copyfileobj(src, dst)
+        return self._write_atomic(key, copy)
+
+    def _entries(self):
+        """Return (mtime, size, path) for every cache entry"""
+        entries = []
+        now = time.time()
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            if name.startswith(TEMP_PREFIX):
+                if now - st.st_mtime > STALE_TEMP_SECONDS:
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        pass
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def evict(self):
+        """Scan the directory and delete least recently used entries until the cache fits its budget
+
+        Entries are deleted down to ``low_water`` of the budget.
+        """
+        if not self._evict_lock.acquire(blocking=False):
+            # Another thread is already scanning
+            return 0
+        try:
+            return self._evict()
+        finally:
+            self._evict_lock.release()
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        self._count("scans")
+        removed = 0
+        if total > self.max_bytes:
+            target = self.max_bytes * self.low_water
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    # Another worker evicted it first
+                    pass
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+        with self._lock:
+            self._bytes = total
+            self._next_scan = time.monotonic() + self.rescan_seconds
+            self._stats["evictions"] += removed
+        return removed
+
+    def stats(self, disk=True):
+        """Hit/miss counters for this process, plus current disk usage (a directory scan) with ``disk``"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        if disk:
+            entries = self._entries()
+            stats["entries"] = len(entries)
+            stats["bytes"] = sum(size for _, size, _ in entries)
+        return stats
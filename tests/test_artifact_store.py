@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+from artifact_store import LOCK_NAME, ArtifactStore
+
+
+def _dead_owner_dir(store, name):
+    """A work directory as a crashed process leaves it: lock file present, lock released"""
+    path = os.path.join(store.work_root, name)
+    os.makedirs(path)
+    open(os.path.join(path, LOCK_NAME), "w").close()
+    open(os.path.join(path, "temp_speaker_0.mp3"), "wb").close()
+    return path
+
+
+def test_cleanup_removes_dir_with_our_pid_and_another_uuid(tmp_path):
+    # A restarted container: same hostname, same pid, different run
+    store = ArtifactStore(str(tmp_path))
+    live = store.workdir
+    stale = _dead_owner_dir(store, f"{store._host}-{os.getpid()}-deadbeef")
+
+    assert store.cleanup_orphans() == 1
+    assert not os.path.exists(stale)
+    assert os.path.isdir(live)
+    store.close()
+
+
+def test_cleanup_keeps_dirs_of_live_owners(tmp_path):
+    other = ArtifactStore(str(tmp_path))
+    other_dir = other.workdir
+    store = ArtifactStore(str(tmp_path))
+
+    assert store.cleanup_orphans() == 0
+    assert os.path.isdir(other_dir)
+    other.close()
+    store.close()
+
+
+def test_cleanup_removes_dir_of_exited_process(tmp_path):
+    code = f"from artifact_store import ArtifactStore; print(ArtifactStore({str(tmp_path)!r}).workdir)"
+    child_dir = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    ).stdout.strip()
+    store = ArtifactStore(str(tmp_path))
+
+    assert os.path.isdir(child_dir)
+    assert store.cleanup_orphans() == 1
+    assert not os.path.exists(child_dir)
@@ -0,0 +1,136 @@
+"""Shape parsed script turns into TTS requests.
+
+``parse_script_for_speakers`` can emit many short parts, and its sentence
+distribution fallback can give consecutive parts to one speaker. Every part
+costs a request (connection, handshake, first-byte latency), so before
+synthesis ``plan_turns`` packs consecutive turns of a speaker up to a size
+target and splits oversize turns at sentence boundaries.
+
+For batched synthesis ``batch_turns`` groups each speaker's turns into
+requests of up to ``batch_chars``; ``locate_turns`` then finds where each
+turn starts and ends in the request's audio from the sentence boundaries the
+engine reports, so the audio can be cut back into turns.
+"""
+import bisect
+import re
+
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def split_at_sentences(text, max_chars):
+    """Split text that exceeds ``max_chars`` at sentence boundaries"""
+    pieces = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text):
+        # A single run-on sentence longer than a chunk gets a hard cut
+        while len(sentence) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def plan_turns(script_parts, target_chars=800, max_chars=1500):
+    """Merge, pack and split ``(text, speaker_idx)`` parts; order is preserved
+
+    Consecutive parts of one speaker are joined while the result stays within
+    ``target_chars``; parts longer than ``max_chars`` are split at sentence
+    boundaries into pieces of at most ``target_chars``.
+    """
+    planned = []
+    for text, speaker_idx in script_parts:
+        text = text.strip()
+        if not text:
+            continue
+        pieces = split_at_sentences(text, target_chars) if len(text) > max_chars else [text]
+        for piece in pieces:
+            if (planned and planned[-1][1] == speaker_idx
+                    and len(planned[-1][0]) + 1 + len(piece) <= target_chars):
+                planned[-1] = (f"{planned[-1][0]} {piece}", speaker_idx)
+            else:
+                planned.append((piece, speaker_idx))
+    return planned
+
+
+def batch_turns(script_parts, batch_chars):
+    """Group turn indices by speaker into requests of up to ``batch_chars``
+
+    Returns ``(speaker_idx, [turn indices])`` ordered by each request's first
+    turn, so requests needed early in the episode are started first.
+    """
+    batches = []
+    open_batches = {}
+    for i, (text, speaker_idx) in enumerate(script_parts):
+        batch = open_batches.get(speaker_idx)
+        if batch is None or batch[2] + len(text) > batch_chars:
+            batch = [speaker_idx, [], 0]
+            batches.append(batch)
+            open_batches[speaker_idx] = batch
+        batch[1].append(i)
+        batch[2] += len(text)
+    return [(speaker_idx, indices) for speaker_idx, indices, _ in batches]
+
+
+def _terminated(text):
+    text = text.strip()
+    return text if text[-1:] in ".!?" else f"{text}."
+
+
+def batch_text(texts):
+    """One request's text; every turn ends a sentence so boundaries never span two turns"""
+    return "\n\n".join(_terminated(text) for text in texts)
+
+
+def _normalize(text):
+    return " ".join(text.split())
+
+
+def locate_turns(texts, boundaries):
+    """``(start, end)`` seconds of every turn of a batched request
+
+    ``texts`` are the turns as passed to batch_text and ``boundaries`` the
+    ``(start, end, text)`` sentence (or word) boundaries reported for the
+    request. Returns None when a boundary cannot be matched to exactly one
+    turn or a turn got no boundary at all; the caller should then render the
+    turns one by one.
+    """
+    normalized = [_normalize(_terminated(text)) for text in texts]
+    starts = []
+    position = 0
+    for text in normalized:
+        starts.append(position)
+        position += len(text) + 1
+    joined = " ".join(normalized)
+
+    spans = [None] * len(texts)
+    cursor = 0
+    for start, end, text in boundaries:
+        text = _normalize(text)
+        if not text:
+            continue
+        found = joined.find(text, cursor)
+        if found < 0:
+            return None
+        turn = bisect.bisect_right(starts, found) - 1
+        if found + len(text) > starts[turn] + len(normalized[turn]):
+            return None
+        cursor = found + len(text)
+        spans[turn] = (start, end) if spans[turn] is None else (spans[turn][0], end)
+    if any(span is None for span in spans):
+        return None
+    return spans
+
+
+def turn_gaps(script_parts, gap_ms):
+    """Pauses between consecutive parts: ``gap_ms`` where the speaker changes, none within a split turn"""
+    return [gap_ms if speaker_idx != previous else 0
+            for (_, previous), (_, speaker_idx) in zip(script_parts, script_parts[1:])]
@@ -0,0 +1,119 @@
+"""Turn audio of recent renders, so an edited script only re-voices what changed.
+
+Every render saves its turns as ``(text, speaker_idx, files)`` together with
+the engine and speaker count that voiced them. When the script is edited,
+``reusable`` diffs the new turns against a saved render and hands back the
+files of every turn whose speaker and text are unchanged; only the rest need
+synthesis. Files are hard links into the artifact store's scratch space, so
+saving a render copies no audio, and the oldest renders are dropped beyond
+``max_renders``.
+"""
+import difflib
+import logging
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+
+def _link(source, target):
+    try:
+        os.link(source, target)
+    except OSError:
+        # Different filesystem, or links unsupported
+        shutil.copyfile(source, target)
+
+
+class RenderRecord:
+    """The turns of one render and how they were voiced"""
+
+    def __init__(self, render_id, engine, speaker_count, turn_gap_ms, turns, directory):
+        self.id = render_id
+        self.engine = engine
+        self.speaker_count = speaker_count
+        self.turn_gap_ms = turn_gap_ms
+        self.turns = turns
+        self.directory = directory
+
+    @property
+    def script_parts(self):
+        return [(text, speaker_idx) for text, speaker_idx, _ in self.turns]
+
+
+class TurnStore:
+    """The last ``max_renders`` renders, kept in ``artifacts`` scratch space"""
+
+    def __init__(self, artifacts, max_renders=8):
+        self.artifacts = artifacts
+        self.max_renders = max_renders
+        self._records = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save(self, render_id, engine, speaker_count, turns, turn_gap_ms):
+        """Keep the files of ``turns`` (``(text, speaker_idx, files)``) under ``render_id``
+
+        The caller keeps its own files; the store links its own names to them.
+        """
+        if not render_id or self.max_renders <= 0:
+            return None
+        directory = self.artifacts.scratch_path(f"render_{render_id}")
+        os.makedirs(directory, exist_ok=True)
+        kept = []
+        try:
+            for i, (text, speaker_idx, files) in enumerate(turns):
+                names = []
+                for j, source in enumerate(files):
+                    target = os.path.join(directory, f"turn_{i}_{j}{os.path.splitext(source)[1]}")
+                    _link(source, target)
+                    names.append(target)
+                kept.append((text, speaker_idx, names))
+        except OSError as e:
+            logger.warning(f"Could not keep turns of render {render_id}: {e}")
+            shutil.rmtree(directory, ignore_errors=True)
+            return None
+        record = RenderRecord(render_id, engine, speaker_count, turn_gap_ms, kept, directory)
+        with self._lock:
+            self._records[render_id] = record
+            self._records.move_to_end(render_id)
+            dropped = []
+            while len(self._records) > self.max_renders:
+                dropped.append(self._records.popitem(last=False)[1])
+        for old in dropped:
+            shutil.rmtree(old.directory, ignore_errors=True)
+        return record
+
+    def get(self, render_id):
+        with self._lock:
+            record = self._records.get(render_id)
+            if record is not None:
+                self._records.move_to_end(render_id)
+            return record
+
+    @staticmethod
+    def reusable(record, script_parts):
+        """For each new ``(text, speaker_idx)`` part, the saved files to reuse or None"""
+        old = [(speaker_idx, text.strip()) for text, speaker_idx in record.script_parts]
+        new = [(speaker_idx, text.strip()) for text, speaker_idx in script_parts]
+        reuse = [None] * len(new)
+        matcher = difflib.SequenceMatcher(None, old, new, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                for offset in range(i2 - i1):
+                    reuse[j1 + offset] = record.turns[i1 + offset][2]
+        return reuse
+
+    def checkout(self, files):
+        """Scratch copies (links) of saved files that the caller may consume"""
+        copies = []
+        for source in files:
+            target = self.artifacts.scratch_path(f"reused_{uuid4().hex[:8]}{os.path.splitext(source)[1]}")
+            _link(source, target)
+            copies.append(target)
+        return copies
+
+    def stats(self):
+        with self._lock:
+            return {"renders": len(self._records), "turns": sum(len(r.turns) for r in self._records.values())}